@@ -17,6 +17,9 @@ setup(
         ],
     },
     python_requires=">=3.9",
+    extras_require={
+        "numpy": ["numpy"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
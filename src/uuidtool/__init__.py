@@ -1,4 +1,50 @@
-from uuidtool.commands.edit import edit_uuid
-from uuidtool.commands.new import uuid_v1, uuid_v2, uuid_v3, uuid_v4, uuid_v5, uuid_v6, uuid_v7, uuid_v8
-from uuidtool.commands.range import uuid_range
-from uuidtool.commands.sandwich import sandwich
+from importlib import import_module
+
+# Names of the public API and the module they come from. Modules are imported on first use,
+# so that running a command doesn't import every other one (and NumPy)
+_EXPORTS = {
+    "analyze": "uuidtool.commands.analyze",
+    "ClockProfile": "uuidtool.commands.analyze",
+    "crack": "uuidtool.commands.crack",
+    "edit_uuid": "uuidtool.commands.edit",
+    "edit_many": "uuidtool.commands.edit",
+    "EditPlan": "uuidtool.commands.edit",
+    "build_index": "uuidtool.commands.index",
+    "NameIndex": "uuidtool.commands.index",
+    "info": "uuidtool.commands.info",
+    "decode": "uuidtool.commands.info",
+    "iter_nearest": "uuidtool.commands.nearest",
+    "new_uuids": "uuidtool.commands.new",
+    "UUIDv7Generator": "uuidtool.commands.new",
+    "uuid_v1": "uuidtool.commands.new",
+    "uuid_v2": "uuidtool.commands.new",
+    "uuid_v3": "uuidtool.commands.new",
+    "uuid_v4": "uuidtool.commands.new",
+    "uuid_v5": "uuidtool.commands.new",
+    "uuid_v6": "uuidtool.commands.new",
+    "uuid_v7": "uuidtool.commands.new",
+    "uuid_v8": "uuidtool.commands.new",
+    "uuid_range": "uuidtool.commands.range",
+    "iter_range": "uuidtool.commands.range",
+    "sandwich": "uuidtool.commands.sandwich",
+    "iter_sandwich": "uuidtool.commands.sandwich",
+    "pack_timestamps": "uuidtool.batch",
+    "iter_packed": "uuidtool.batch",
+    "TimingModel": "uuidtool.model",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'uuidtool' has no attribute '{name}'")
+    
+    value = getattr(import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,294 @@
+import binascii, sys
+from array import array
+from itertools import islice
+from typing import Iterator, Literal
+from uuid import UUID
+
+from uuidtool.commands.info import UUIDFields, decode
+from uuidtool.utils import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Per version: (duration of one timestamp tick in ns, epoch offset in ns, bits of the 64 high bits to keep)
+TIME_LAYOUTS = {
+    1: (100, GREGORIAN_UNIX_OFFSET, 0x00000000_0000_f000),
+    2: (V2_CLOCK_TICK, GREGORIAN_UNIX_OFFSET, 0xffffffff_0000_f000),
+    6: (100, GREGORIAN_UNIX_OFFSET, 0x00000000_0000_f000),
+    7: (1_000_000, 0, 0x00000000_0000_ffff),
+}
+
+DEFAULT_CHUNK_SIZE = 65536
+
+# Output formats of encode_packed
+FORMATS = ("text", "hex", "raw", "base64")
+
+
+def pack_timestamps(uuid: "str | UUID", timestamps: range, sort: Literal["asc", "desc", "alt"] = "asc",
+                    start: int = 0, stop: int = None) -> bytearray:
+    """Build UUIDs sharing every field of a template UUID except the timestamp, as packed 16 bytes records.
+    No UUID object is created, each record is the big endian representation of a UUID (like UUID.bytes)
+
+    :param uuid: The template UUID
+    :param timestamps: The timestamps in nanoseconds, in ascending order. The step must be a multiple of the clock tick of the UUID version
+    :param sort: Way to sort the resulting UUIDs
+    :param start: Position in the sorted order of the first UUID to build
+    :param stop: Position in the sorted order after the last UUID to build, defaults to the end
+    """
+
+    uuid = get_uuid(uuid)
+    version = get_version(uuid)
+    iter_sorted(timestamps, sort)  # Fail early on an invalid sort mode
+
+    if version not in TIME_LAYOUTS:
+        raise UUIDToolError(f"Time is not supported for UUID version {version}")
+
+    tick_ns, offset, keep = TIME_LAYOUTS[version]
+
+    if timestamps.step % tick_ns != 0:
+        raise UUIDToolError(f"Timestamp step must be a multiple of {tick_ns} ns for UUID version {version}, got {timestamps.step}")
+
+    first_tick = (timestamps.start + offset) // tick_ns
+    ticks = range(first_tick, first_tick + len(timestamps) * (timestamps.step // tick_ns), timestamps.step // tick_ns)
+
+    size = len(ticks)
+    stop = size if stop is None else min(stop, size)
+    start = min(max(start, 0), stop)
+
+    high = (uuid.int >> 64) & keep
+    low = uuid.int & 0xffffffff_ffffffff
+
+    if np is not None:
+        return _pack_numpy(version, ticks, sort, start, stop, high, low)
+    return _pack_python(version, ticks, sort, start, stop, high, low)
+
+
+def iter_packed(uuid: "str | UUID", timestamps: range, sort: Literal["asc", "desc", "alt"] = "asc",
+                chunk_size: int = DEFAULT_CHUNK_SIZE, start: int = 0, stop: int = None) -> Iterator[bytearray]:
+    """Lazily build packed UUIDs by chunks, see pack_timestamps
+
+    :param uuid: The template UUID
+    :param timestamps: The timestamps in nanoseconds, in ascending order
+    :param sort: Way to sort the resulting UUIDs
+    :param chunk_size: Maximum number of UUIDs per chunk
+    :param start: Position in the sorted order of the first UUID to build
+    :param stop: Position in the sorted order after the last UUID to build, defaults to the end
+    """
+
+    uuid = get_uuid(uuid)
+    iter_sorted(timestamps, sort)  # Fail early on an invalid sort mode
+
+    if chunk_size < 1:
+        raise UUIDToolError(f"Chunk size must be at least 1, got {chunk_size}")
+
+    stop = len(timestamps) if stop is None else min(stop, len(timestamps))
+
+    def chunks():
+        for position in range(start, stop, chunk_size):
+            yield pack_timestamps(uuid, timestamps, sort, position, min(position + chunk_size, stop))
+
+    return chunks()
+
+
+def as_array(buffer: "bytes | bytearray"):
+    """Get a NumPy uint8[N, 16] view of packed UUIDs without copying them
+
+    :param buffer: The packed UUIDs
+    """
+
+    if np is None:
+        raise UUIDToolError("NumPy is required for this feature, install it with `pip install numpy`")
+
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(-1, 16)
+
+
+def unpack(buffer: "bytes | bytearray") -> Iterator[UUID]:
+    """Lazily convert packed UUIDs back to UUID objects
+
+    :param buffer: The packed UUIDs
+    """
+
+    view = memoryview(buffer)
+    return (UUID(bytes=bytes(view[i:i + 16])) for i in range(0, len(view), 16))
+
+
+def format_packed(buffer: "bytes | bytearray") -> str:
+    """Format packed UUIDs as text, one canonical UUID per line
+
+    :param buffer: The packed UUIDs
+    """
+
+    h = buffer.hex()
+    return "".join(f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}\n"
+                   for i in range(0, len(h), 32))
+
+
+def encode_packed(buffer: "bytes | bytearray", fmt: str = "text") -> "bytes | bytearray":
+    """Encode packed UUIDs in an output format: text (canonical UUIDs), hex (32 hex digits) or base64,
+    one UUID per line, or raw (the packed 16 bytes records as is, so the output can be memory mapped)
+
+    :param buffer: The packed UUIDs
+    :param fmt: The output format, one of FORMATS
+    """
+
+    if fmt == "raw":
+        return buffer
+    elif fmt == "text":
+        return format_packed(buffer).encode()
+    elif fmt == "hex":
+        return buffer.hex("\n", 16).encode() + b"\n" if buffer else b""
+    elif fmt == "base64":
+        view = memoryview(buffer)
+        return b"".join(binascii.b2a_base64(view[i:i + 16]) for i in range(0, len(view), 16))
+
+    raise UUIDToolError(f"Invalid format: Expected one of {', '.join(FORMATS)}, got {fmt}")
+
+
+def decode_columns(uuids) -> dict:
+    """Decode many UUIDs at once into columns, one per field of UUIDFields (except uuid).
+    
+    With NumPy, each column is a masked array where fields that don't apply to the version
+    of a UUID are masked. Timestamps outside of the int64 range (before 1677 or after 2262) are masked as well.
+    Without NumPy, each column is a list where these fields are None.
+
+    :param uuids: Packed UUIDs (bytes, or a uint8[N, 16] array) or a tuple of 2 uint64 columns (high and low 64 bits)
+    """
+
+    if np is None:
+        if isinstance(uuids, tuple):
+            high, low = uuids
+            uuids = [UUID(int=(h << 64) | l) for h, l in zip(high, low)]
+        else:
+            uuids = unpack(uuids)
+
+        rows = [decode(uuid)[1:] for uuid in uuids]
+        return {field: [row[i] for row in rows] for i, field in enumerate(UUIDFields._fields[1:])}
+
+    if isinstance(uuids, tuple):
+        high, low = (np.asarray(column, dtype=np.uint64) for column in uuids)
+    else:
+        if not isinstance(uuids, np.ndarray):
+            uuids = np.frombuffer(uuids, dtype=np.uint8)
+        columns = np.ascontiguousarray(uuids, dtype=np.uint8).reshape(-1, 16).view(">u8").astype(np.uint64)
+        high, low = columns[:, 0], columns[:, 1]
+
+    version = ((high >> 12) & 0xf).astype(np.uint8)
+    variant = ((low >> 60) & 0xf).astype(np.uint8)
+
+    is_v1, is_v2, is_v6, is_v7, is_v8 = (version == 1), (version == 2), (version == 6), (version == 7), (version == 8)
+    has_node = is_v1 | is_v2 | is_v6
+
+    # uint64 arithmetic wraps around, the result is right once viewed as int64
+    with np.errstate(over="ignore"):
+        offset = np.uint64(GREGORIAN_UNIX_OFFSET % 2**64)
+        v1_ticks = ((high & 0xfff) << 48) | (((high >> 16) & 0xffff) << 32) | (high >> 32)
+        v2_ticks = ((high & 0xfff) << 16) | ((high >> 16) & 0xffff)
+        v6_ticks = ((high >> 16) << 12) | (high & 0xfff)
+        timestamp_ns = np.select(
+            [is_v1, is_v2, is_v6, is_v7],
+            [v1_ticks * np.uint64(100) - offset,
+             v2_ticks * np.uint64(V2_CLOCK_TICK) - offset,
+             v6_ticks * np.uint64(100) - offset,
+             (high >> 16) * np.uint64(1_000_000)],
+            np.uint64(0)
+        ).view(np.int64)
+
+    # Timestamps that don't fit in int64 would have wrapped around, they are masked instead
+    in_range = np.select(
+        [is_v1, is_v2, is_v6, is_v7],
+        [_in_int64(v1_ticks, 100, GREGORIAN_UNIX_OFFSET),
+         _in_int64(v2_ticks, V2_CLOCK_TICK, GREGORIAN_UNIX_OFFSET),
+         _in_int64(v6_ticks, 100, GREGORIAN_UNIX_OFFSET),
+         _in_int64(high >> 16, 1_000_000, 0)],
+        False
+    )
+
+    clock_seq = np.where(is_v2, (low >> 56) & 0x3f, (low >> 48) & 0x3fff)
+
+    return {
+        "version": version,
+        "variant": variant,
+        "timestamp_ns": np.ma.masked_array(timestamp_ns, ~in_range),
+        "clock_seq": np.ma.masked_array(clock_seq, ~has_node),
+        "node": np.ma.masked_array(low & 0xffffffffffff, ~has_node),
+        "local_id": np.ma.masked_array(high >> 32, ~is_v2),
+        "local_domain": np.ma.masked_array((low >> 48) & 0xff, ~is_v2),
+        "custom_a": np.ma.masked_array(high >> 16, ~is_v8),
+        "custom_b": np.ma.masked_array(high & 0xfff, ~is_v8),
+        "custom_c": np.ma.masked_array(low & 0x3fffffffffffffff, ~is_v8),
+    }
+
+
+def _in_int64(ticks, tick_ns: int, offset: int):
+    # Check that ticks * tick_ns - offset fits in int64, with exact Python integer bounds
+
+    lowest = max(0, -((2**63 - offset) // tick_ns))
+    highest = (2**63 - 1 + offset) // tick_ns
+    return (ticks >= np.uint64(lowest)) & (ticks <= np.uint64(min(highest, 2**64 - 1)))
+
+
+def _pack_python(version: int, ticks: range, sort: str, start: int, stop: int, high: int, low: int) -> bytearray:
+
+    ticks = islice(iter_sorted(ticks, sort, start), stop - start)
+
+    if version == 1:
+        highs = array("Q", (high | ((t & 0xffffffff) << 32) | (((t >> 32) & 0xffff) << 16) | ((t >> 48) & 0x0fff)
+                            for t in ticks))
+    elif version == 2:
+        highs = array("Q", (high | ((t & 0xffff) << 16) | ((t >> 16) & 0x0fff) for t in ticks))
+    elif version == 6:
+        highs = array("Q", (high | (((t >> 12) & 0xffffffffffff) << 16) | (t & 0x0fff) for t in ticks))
+    else:
+        highs = array("Q", (high | ((t & 0xffffffffffff) << 16) for t in ticks))
+
+    lows = array("Q", [low]) * len(highs)
+    if sys.byteorder == "little":
+        highs.byteswap()
+        lows.byteswap()
+
+    out = bytearray(16 * len(highs))
+    view = memoryview(out).cast("Q")
+    view[0::2] = highs
+    view[1::2] = lows
+
+    return out
+
+
+def _pack_numpy(version: int, ticks: range, sort: str, start: int, stop: int, high: int, low: int) -> bytearray:
+
+    positions = np.arange(start, stop, dtype=np.int64)
+    size = len(ticks)
+
+    if sort == "asc":
+        indexes = positions
+    elif sort == "desc":
+        indexes = size - 1 - positions
+    else:
+        mid = size // 2
+        if size % 2 != 0:
+            k = (positions + 1) // 2
+            indexes = np.where(positions % 2 == 1, mid - k, mid + k)
+        else:
+            k = positions // 2
+            indexes = np.where(positions % 2 == 0, mid - 1 - k, mid + k)
+
+    t = (ticks.start + indexes * ticks.step).astype(np.uint64)
+
+    if version == 1:
+        highs = ((t & 0xffffffff) << 32) | (((t >> 32) & 0xffff) << 16) | ((t >> 48) & 0x0fff)
+    elif version == 2:
+        highs = ((t & 0xffff) << 16) | ((t >> 16) & 0x0fff)
+    elif version == 6:
+        highs = (((t >> 12) & 0xffffffffffff) << 16) | (t & 0x0fff)
+    else:
+        highs = (t & 0xffffffffffff) << 16
+
+    out = bytearray(16 * len(positions))
+    view = np.frombuffer(out, dtype=">u8").reshape(-1, 2)
+    view[:, 0] = highs | np.uint64(high)
+    view[:, 1] = low
+
+    return out
@@ -0,0 +1,58 @@
+import json, os
+from typing import NamedTuple
+
+from uuidtool.utils import *
+
+
+class Checkpoint(NamedTuple):
+    """Progress of a range or sandwich job, saved to a file so that an interrupted job can be resumed
+    exactly where it stopped. The first fields identify the job, position and written are the progress"""
+    uuid: str
+    timestamps: "tuple[int, int, int]"
+    sort: str
+    format: str
+    fit: "str | None" = None
+    shard: "str | None" = None
+    position: int = 0
+    written: int = 0
+
+    @classmethod
+    def load(cls, path: str) -> "Checkpoint":
+        """Load a checkpoint saved by save
+
+        :param path: The checkpoint file
+        """
+
+        try:
+            with open(path) as f:
+                checkpoint = cls(**json.load(f))
+            return checkpoint._replace(timestamps=tuple(checkpoint.timestamps))
+        except OSError as e:
+            raise UUIDToolError(f"Cannot read the checkpoint {path}: {e.strerror}")
+        except (ValueError, TypeError) as e:
+            raise UUIDToolError(f"Invalid checkpoint {path}: {e}")
+
+    def save(self, path: str):
+        """Save the checkpoint. The file is replaced at once, so it is never left half written
+
+        :param path: The checkpoint file
+        """
+
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(self._asdict(), f)
+            os.replace(tmp, path)
+        except OSError as e:
+            raise UUIDToolError(f"Cannot save the checkpoint {path}: {e.strerror}")
+
+    def check(self, job: "Checkpoint"):
+        """Check that the checkpoint was saved by the same job, with the same options
+
+        :param job: A checkpoint of the job to resume, its progress is ignored
+        """
+
+        for field in ("uuid", "timestamps", "sort", "format", "fit", "shard"):
+            if getattr(self, field) != getattr(job, field):
+                raise UUIDToolError(f"The checkpoint was saved by another job: its {field} is "
+                                    f"{getattr(self, field)}, not {getattr(job, field)}")
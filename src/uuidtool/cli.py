@@ -1,19 +1,39 @@
-import argparse, traceback, sys
+import argparse, json, os, sys
+from functools import lru_cache
+from itertools import islice
 
-from uuidtool.commands.edit import edit_uuid
-from uuidtool.commands.info import info
-from uuidtool.commands.new import new_uuid
-from uuidtool.commands.range import uuid_range
-from uuidtool.commands.sandwich import sandwich
+from uuidtool.client import SOCKET_ENV
+from uuidtool.output import Output, handle_broken_pipe
 from uuidtool.utils import *
 
+# Command modules are imported when their command runs, so that startup only pays for what it uses
+
 EPILOG = """some documentation about UUIDs:
 - RCF 9562: https://datatracker.ietf.org/doc/html/rfc9562
 - RFC 4122: https://datatracker.ietf.org/doc/html/rfc4122 (obsolete)
 - UUIDv2 documentation: https://pubs.opengroup.org/onlinepubs/9696989899/chap5.htm#tagcjh_08_02_01_01
 """
 
-def main():
+def main(argv: "list[str]" = None):
+    
+    argv = sys.argv[1:] if argv is None else argv
+    
+    # Answer from a warm uuidtool serve process when there is one, to skip the startup cost
+    socket_path = os.environ.get(SOCKET_ENV)
+    if socket_path:
+        from uuidtool.client import can_forward, forward
+        try:
+            code = forward(socket_path, argv) if can_forward(argv) else None
+        except BrokenPipeError:
+            handle_broken_pipe()
+        if code is not None:
+            sys.exit(code)
+    
+    run(argv)
+
+
+@lru_cache(maxsize=None)
+def build_parser() -> argparse.ArgumentParser:
     
     parser = argparse.ArgumentParser(
         prog="uuidtool",
@@ -25,10 +45,13 @@ def main():
     subparsers = parser.add_subparsers(dest="command", help="Sub-command help")
     
     parser_info = subparsers.add_parser("info", help="Display information about a UUID")
-    parser_info.add_argument("uuid", help="UUID to display information about")
+    parser_info.add_argument("uuid", nargs="?", help="UUID to display information about, or - to read UUIDs from stdin")
+    parser_info.add_argument("-f", "--file", help="File to read UUIDs from, one per line")
+    parser_info.add_argument("--format", choices=["jsonl", "csv", "tsv"], default="jsonl", help="Output format when reading UUIDs from stdin or a file")
 
     parser_edit = subparsers.add_parser("edit", help="Edit a UUID")
-    parser_edit.add_argument("uuid", help="UUID to edit")
+    parser_edit.add_argument("uuid", nargs="?", help="UUID to edit, or - to edit UUIDs from stdin")
+    parser_edit.add_argument("-f", "--file", help="File to read UUIDs to edit from, one per line")
     parser_edit.add_argument("-t", "--time", help="Time to use for the UUID v1, v2, v6 or v7")
     parser_edit.add_argument("-c", "--clock-sequence", type=int, help="Clock sequence to use for UUID v1 or v2")
     parser_edit.add_argument("-n", "--node", help="Node (MAC address) to use for UUID v1, v2 or v6")
@@ -42,14 +65,60 @@ def main():
     parser_sandwich.add_argument("uuid1", help="First UUID")
     parser_sandwich.add_argument("uuid2", help="Second UUID")
     parser_sandwich.add_argument("-s", "--sort", choices=["asc", "desc", "alt"], default="alt", help="Sort mode for the UUID range")
+    parser_sandwich.add_argument("-w", "--workers", type=int, help="Number of processes used to generate the UUIDs")
+    parser_sandwich.add_argument("--split-output", metavar="PREFIX", help="Write each worker's share of the UUIDs to its own file PREFIX.<n> instead of stdout")
+    parser_sandwich.add_argument("--profile", metavar="FILE", help="Clock profile of the generator (JSON output of analyze), only timestamps it can produce are generated")
+    parser_sandwich.add_argument("--fit", metavar="FILE", help="Order the UUIDs from the most to the least likely, estimated from a sample of UUIDs of the same generator (one per line, - for stdin)")
+    parser_sandwich.add_argument("--format", choices=["text", "hex", "raw", "base64"], default="text", help="Output format: canonical UUIDs, 32 hex digits or base64, one per line, or raw 16 bytes records")
+    parser_sandwich.add_argument("-o", "--output", metavar="FILE", help="Write the UUIDs to FILE instead of stdout")
+    parser_sandwich.add_argument("--checkpoint", metavar="FILE", help="Save the progress of the job to FILE, so that it can be resumed with --resume")
+    parser_sandwich.add_argument("--resume", action="store_true", help="Resume the job saved in the --checkpoint file where it stopped")
+    parser_sandwich.add_argument("--shard", metavar="K/N", help="Only generate the K-th of N contiguous parts of the output (K from 1 to N), the N parts together give the whole output")
     
     parser_range = subparsers.add_parser("range", help="Generate a range of UUIDs whose timestamp is close to the timestamp of a given UUID")
     parser_range.add_argument("uuid", help="UUID to start the range")
     parser_range.add_argument("count", type=int, help="Number of UUIDs to generate")
     parser_range.add_argument("-s", "--sort", choices=["asc", "desc", "alt"], default="alt", help="Sort mode for the UUID range")
+    parser_range.add_argument("-w", "--workers", type=int, help="Number of processes used to generate the UUIDs")
+    parser_range.add_argument("--split-output", metavar="PREFIX", help="Write each worker's share of the UUIDs to its own file PREFIX.<n> instead of stdout")
+    parser_range.add_argument("--profile", metavar="FILE", help="Clock profile of the generator (JSON output of analyze), only timestamps it can produce are generated")
+    parser_range.add_argument("--fit", metavar="FILE", help="Order the UUIDs from the most to the least likely, estimated from a sample of UUIDs of the same generator (one per line, - for stdin)")
+    parser_range.add_argument("--format", choices=["text", "hex", "raw", "base64"], default="text", help="Output format: canonical UUIDs, 32 hex digits or base64, one per line, or raw 16 bytes records")
+    parser_range.add_argument("-o", "--output", metavar="FILE", help="Write the UUIDs to FILE instead of stdout")
+    parser_range.add_argument("--checkpoint", metavar="FILE", help="Save the progress of the job to FILE, so that it can be resumed with --resume")
+    parser_range.add_argument("--resume", action="store_true", help="Resume the job saved in the --checkpoint file where it stopped")
+    parser_range.add_argument("--shard", metavar="K/N", help="Only generate the K-th of N contiguous parts of the output (K from 1 to N), the N parts together give the whole output")
+
+    parser_analyze = subparsers.add_parser("analyze", help="Infer the clock behavior of a UUID generator from a sample of its UUIDs")
+    parser_analyze.add_argument("file", nargs="?", default="-", help="File to read the sampled UUIDs from, one per line (default: stdin)")
+    parser_analyze.add_argument("--json", action="store_true", help="Print the profile as JSON, to use it with --profile")
+
+    parser_crack = subparsers.add_parser("crack", help="Find the names of UUIDs v3 and v5 from a wordlist")
+    parser_crack.add_argument("uuids", nargs="+", help="UUIDs v3 or v5 to crack")
+    parser_crack.add_argument("-f", "--file", default="-", help="Wordlist to read the candidate names from, one per line (default: stdin)")
+    parser_crack.add_argument("-N", "--namespace", action="append", help="Namespace to try, a UUID or @dns, @url, @oid, @x500. Can be repeated, defaults to the 4 of them")
+    parser_crack.add_argument("-r", "--rule", action="append", help="Mangling rule applied to each word: none, lower, upper, capitalize, title, reverse, or a template like {word}@example.com. Can be repeated, defaults to none")
+    parser_crack.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="Number of processes (default: number of CPUs)")
+
+    parser_index = subparsers.add_parser("index", help="Precompute the UUIDs v3 and v5 of a wordlist into an index for lookup")
+    parser_index.add_argument("wordlist", help="Wordlist to index, one name per line")
+    parser_index.add_argument("index", help="Path of the index to write")
+    parser_index.add_argument("-N", "--namespace", action="append", help="Namespace to index, a UUID or @dns, @url, @oid, @x500. Can be repeated, defaults to the 4 of them")
+    parser_index.add_argument("-v", "--version", type=int, action="append", choices=[3, 5], help="UUID version to index. Can be repeated, defaults to 3 and 5")
+
+    parser_lookup = subparsers.add_parser("lookup", help="Find the names of UUIDs v3 and v5 in an index built with index")
+    parser_lookup.add_argument("index", help="Path of the index")
+    parser_lookup.add_argument("uuids", nargs="*", help="UUIDs to look up")
+    parser_lookup.add_argument("-f", "--file", help="File to read the UUIDs to look up from, one per line (- for stdin)")
+    parser_lookup.add_argument("--wordlist", help="Path of the wordlist, defaults to the one the index was built from")
+
+    parser_nearest = subparsers.add_parser("nearest", help="Generate the UUIDs closest in time to any of several anchor UUIDs, closest first")
+    parser_nearest.add_argument("anchors", nargs="+", help="Anchor UUIDs, they must all have the same version")
+    parser_nearest.add_argument("-b", "--budget", type=int, required=True, help="Maximum number of UUIDs to generate")
 
     parser_new = subparsers.add_parser("new", help="Generate a new UUID")
     parser_new.add_argument("-v", "--version", default=4, type=int, help="UUID version")
+    parser_new.add_argument("--count", type=int, default=1, help="Number of UUIDs to generate")
     parser_new.add_argument("-t", "--time", help="Time to use for UUID v1, v2, v6 or v7")
     parser_new.add_argument("-c", "--clock-sequence", type=int, help="Clock sequence for UUID v1 or v2")
     parser_new.add_argument("-n", "--node", help="Node (MAC address) for UUID v1, v2 or v6")
@@ -63,8 +132,36 @@ def main():
     parser_new.add_argument("--custom-c", help="Custom field C for UUID v8")
 
     
+    parser_probe = subparsers.add_parser("probe", help="Send an HTTP request for each candidate UUID and report the hits")
+    parser_probe.add_argument("url", help="URL to request, {uuid} is replaced by each candidate")
+    parser_probe.add_argument("-f", "--file", default="-", help="File to read the candidates from, one per line, stdin by default")
+    parser_probe.add_argument("-X", "--method", default="GET", help="HTTP method")
+    parser_probe.add_argument("-d", "--data", help="Request body, {uuid} is replaced by each candidate")
+    parser_probe.add_argument("-H", "--header", action="append", default=[], help="Additional header, as 'Name: value'")
+    parser_probe.add_argument("-c", "--concurrency", type=int, default=16, help="Number of connections")
+    parser_probe.add_argument("--match-status", type=int, action="append", help="Status code of a hit, can be repeated. Any 2xx status by default")
+    parser_probe.add_argument("--match-text", help="Text that the response body of a hit must contain")
+    parser_probe.add_argument("--max-hits", type=int, default=1, help="Stop after this number of hits, 0 to try every candidate")
+    parser_probe.add_argument("--timeout", type=float, default=10.0, help="Timeout of each request in seconds")
+    
+    parser_bench = subparsers.add_parser("bench", help="Measure the throughput and peak memory of every command")
+    parser_bench.add_argument("--sizes", type=int, nargs="+", help="Number of UUIDs handled by each run (default: 1000 10000 100000)")
+    parser_bench.add_argument("--repeat", type=int, default=3, help="Number of timed runs, the fastest one is kept")
+    parser_bench.add_argument("--only", nargs="+", help="Names (or prefixes of names) of the benchmarks to run")
+    parser_bench.add_argument("-o", "--output", help="File to write the JSON results to, stdout by default")
+    parser_bench.add_argument("--compare", help="JSON results of a previous run to compare against")
+
+    parser_serve = subparsers.add_parser("serve", help="Answer uuidtool commands from a warm process, over a Unix socket or stdio")
+    parser_serve.add_argument("-s", "--socket", help=f"Unix socket to listen on, stdio by default. Set {SOCKET_ENV} to this path to make uuidtool use it")
+
+    return parser
 
-    args = parser.parse_args()
+
+def run(argv: "list[str]"):
+    """Run a uuidtool command in this process"""
+    
+    parser = build_parser()
+    args = parser.parse_args(argv)
     
     command: str = args.command
     
@@ -73,24 +170,108 @@ def main():
         time_arg = parse_time(args.time) if hasattr(args, "time") else None
         
         if command == "info":
-            i = info(args.uuid)
-            print(i)
+            from uuidtool.commands.info import info, iter_info_records, write_info_records
+            if args.file is not None or args.uuid == "-":
+                with open_input(args.file or "-") as f, Output() as out:
+                    write_info_records(iter_info_records(f), args.format, out)
+            elif args.uuid is not None:
+                i = info(args.uuid)
+                print(i)
+            else:
+                raise UUIDToolError("A UUID, - or --file is required")
         elif command == "edit":
-            uuid = edit_uuid(args.uuid, time_arg, args.clock_sequence, args.node, args.local_id, args.local_domain,
-                             args.custom_a, args.custom_b, args.custom_c)
-            print(uuid)
-        elif command == "sandwich":
-            uuids = sandwich(args.uuid1, args.uuid2, args.sort)
-            for uuid in uuids:
+            from uuidtool.commands.edit import edit_many, edit_uuid
+            if args.file is not None or args.uuid == "-":
+                with open_input(args.file or "-") as f, Output() as out:
+                    out.write_lines(edit_many(f, time_arg, args.clock_sequence, args.node, args.local_id, args.local_domain,
+                                              args.custom_a, args.custom_b, args.custom_c, skip_invalid=True))
+            elif args.uuid is not None:
+                uuid = edit_uuid(args.uuid, time_arg, args.clock_sequence, args.node, args.local_id, args.local_domain,
+                                 args.custom_a, args.custom_b, args.custom_c)
                 print(uuid)
+            else:
+                raise UUIDToolError("A UUID, - or --file is required")
+        elif command == "sandwich":
+            from uuidtool.commands.sandwich import sandwich_timestamps
+            uuid1 = get_uuid(args.uuid1)
+            timestamps = sandwich_timestamps(uuid1, get_uuid(args.uuid2), read_profile(args.profile))
+            write_uuids(uuid1, timestamps, args)
         elif command == "range":
-            uuids = uuid_range(args.uuid, args.count, args.sort)
-            for uuid in uuids:
-                print(uuid)
+            from uuidtool.commands.range import range_timestamps
+            uuid = get_uuid(args.uuid)
+            timestamps = range_timestamps(uuid, args.count, read_profile(args.profile))
+            write_uuids(uuid, timestamps, args)
+        elif command == "analyze":
+            from uuidtool.commands.analyze import analyze, format_profile
+            with open_input(args.file) as f:
+                profile = analyze(line.strip() for line in f if line.strip())
+            if args.json:
+                print(json.dumps(profile._asdict()))
+            else:
+                print(format_profile(profile))
+        elif command == "nearest":
+            from uuidtool.commands.nearest import iter_nearest
+            with Output() as out:
+                out.write_lines(iter_nearest(args.anchors, args.budget))
         elif command == "new":
-            uuid = new_uuid(args.version, time_arg, args.clock_sequence, args.node, args.local_id, args.local_domain,
-                            args.namespace, args.name, args.custom_a, args.custom_b, args.custom_c)
-            print(uuid)
+            from uuidtool.commands.new import new_uuids
+            uuids = new_uuids(args.count, args.version, time_arg, args.clock_sequence, args.node, args.local_id,
+                              args.local_domain, args.namespace, args.name, args.custom_a, args.custom_b, args.custom_c)
+            with Output() as out:
+                out.write_lines(uuids)
+        elif command == "crack":
+            from uuidtool.commands.crack import crack
+            with open_input(args.file) as f, Output() as out:
+                result = crack(args.uuids, f.buffer, args.namespace, args.rule, args.workers,
+                               on_match=lambda *match: write_now(out, *match))
+            print(f"{result.hashes} hashes in {result.seconds:.2f}s ({result.per_second:.0f} hashes/s), "
+                  f"{len(result.matches)} found", file=sys.stderr)
+        elif command == "index":
+            from uuidtool.commands.index import build_index
+            count = build_index(args.wordlist, args.index, args.namespace, args.version or (3, 5))
+            print(f"{count} UUIDs indexed", file=sys.stderr)
+        elif command == "lookup":
+            from uuidtool.commands.index import NameIndex
+            uuids = args.uuids
+            if args.file is not None:
+                with open_input(args.file) as f:
+                    uuids = uuids + [line.strip() for line in f if line.strip()]
+            if not uuids:
+                raise UUIDToolError("At least one UUID or --file is required")
+            
+            with NameIndex(args.index, args.wordlist) as index, Output() as out:
+                out.write_lines(f"{uuid} {namespace} {name}"
+                                for uuid, names in index.lookup_many(uuids) for namespace, name in names)
+        elif command == "probe":
+            from uuidtool.commands.probe import probe
+            headers = {}
+            for header in args.header:
+                name, sep, value = header.partition(":")
+                if not sep:
+                    raise UUIDToolError(f"Invalid header: {header}, expected 'Name: value'")
+                headers[name.strip()] = value.strip()
+            
+            with open_input(args.file) as f, Output() as out:
+                result = probe(f, args.url, args.method, args.data, headers, args.concurrency, args.match_status,
+                               args.match_text, args.max_hits, args.timeout,
+                               on_hit=lambda *hit: write_now(out, *hit))
+            print(f"{result.requests} requests in {result.seconds:.2f}s ({result.per_second:.0f} req/s), "
+                  f"{len(result.hits)} hit(s)", file=sys.stderr)
+        elif command == "serve":
+            from uuidtool.commands.serve import serve
+            serve(args.socket)
+        elif command == "bench":
+            from uuidtool.commands.bench import bench, compare, DEFAULT_SIZES
+            results = bench(args.sizes or DEFAULT_SIZES, args.repeat, args.only)
+            if args.compare is not None:
+                with open_input(args.compare) as f:
+                    results["comparison"] = compare(json.load(f), results)
+            results = json.dumps(results, indent=2)
+            if args.output is not None:
+                with open(args.output, "w") as f:
+                    f.write(results + "\n")
+            else:
+                print(results)
         elif command is None:
             parser.print_help()
         else:
@@ -98,13 +279,138 @@ def main():
                 
     except UUIDToolError as e:
         print(*e.args, file=sys.stderr)
-        exit(1)
+        sys.exit(1)
+    
+    except BrokenPipeError:
+        handle_broken_pipe()
         
     except Exception as e:
+        import traceback
         print(f"An unexpected error occurred: {e}", file=sys.stderr)
         print("Please report this issue to the developer", file=sys.stderr)
         traceback.print_exc()
-        exit(1)
+        sys.exit(1)
+
+
+def write_now(out: Output, *fields):
+    """Write a line of space separated fields and flush it, for results that show up while a command runs"""
+    
+    out.write_line(" ".join(map(str, fields)))
+    out.flush()
+
+
+def fit_model(path: "str | None", step_ns: int = None) -> "TimingModel | None":
+    """Fit a timing model from a file of sampled UUIDs, one per line, to order timestamps spaced by step_ns"""
+    
+    if path is None:
+        return None
+    
+    from uuidtool.model import TimingModel
+    
+    with open_input(path) as f:
+        return TimingModel.fit((line.strip() for line in f if line.strip()), step_ns=step_ns)
+
+
+def read_profile(path: "str | None") -> "ClockProfile | None":
+    """Read a clock profile from a JSON file written by analyze --json"""
+    
+    if path is None:
+        return None
+    
+    from uuidtool.commands.analyze import ClockProfile
+    
+    with open_input(path) as f:
+        try:
+            profile = json.load(f)
+        except ValueError as e:
+            raise UUIDToolError(f"Invalid profile {path}: {e}")
+    
+    if not isinstance(profile, dict):
+        raise UUIDToolError(f"Invalid profile {path}: expected a JSON object")
+    return ClockProfile.from_dict(profile)
+
+
+def read_shard(shard: "str | None", size: int) -> "tuple[int, int]":
+    """Get the positions in the sorted order of the UUIDs of --shard K/N"""
+    
+    if shard is None:
+        return 0, size
+    
+    k, sep, n = shard.partition("/")
+    if not sep or not k.isdigit() or not n.isdigit() or not 1 <= int(k) <= int(n):
+        raise UUIDToolError(f"Invalid shard: Expected K/N with 1 <= K <= N, got {shard}")
+    
+    return shard_bounds(size, int(k) - 1, int(n))
+
+
+def read_checkpoint(uuid: UUID, timestamps: range, args: argparse.Namespace) -> "Checkpoint | None":
+    """Start a checkpoint for --checkpoint, or load the one to resume with --resume"""
+    
+    if args.checkpoint is None:
+        if args.resume:
+            raise UUIDToolError("--resume requires --checkpoint")
+        return None
+    
+    from uuidtool.checkpoint import Checkpoint
+    
+    job = Checkpoint(str(uuid), (timestamps.start, timestamps.stop, timestamps.step), args.sort, args.format, args.fit,
+                     args.shard)
+    if not args.resume:
+        job.save(args.checkpoint)
+        return job
+    
+    checkpoint = Checkpoint.load(args.checkpoint)
+    checkpoint.check(job)
+    return checkpoint
+
+
+def write_uuids(uuid: UUID, timestamps: range, args: argparse.Namespace):
+    """Generate the UUIDs of range or sandwich by chunks, in the format of --format, to stdout, to --output
+    or to one file per worker with --split-output. Only the positions of --shard are generated, and with
+    --checkpoint, the position is saved after each chunk"""
+    
+    from uuidtool.batch import DEFAULT_CHUNK_SIZE, encode_packed, iter_packed
+    
+    if args.fit is not None and (args.workers is not None or args.split_output is not None):
+        raise UUIDToolError("--fit can't be used with --workers or --split-output")
+    
+    if args.split_output is not None:
+        if args.output is not None or args.checkpoint is not None or args.shard is not None:
+            raise UUIDToolError("--output, --checkpoint and --shard can't be used with --split-output")
+        from uuidtool.parallel import parallel_to_files
+        parallel_to_files(uuid, timestamps, args.split_output, args.sort, args.workers, fmt=args.format)
+        return
+    
+    start, stop = read_shard(args.shard, len(timestamps))
+    checkpoint = read_checkpoint(uuid, timestamps, args)
+    if checkpoint is not None:
+        start = max(start, checkpoint.position)
+    
+    if args.workers is not None:
+        from uuidtool.parallel import parallel_packed
+        chunks = parallel_packed(uuid, timestamps, args.sort, args.workers, DEFAULT_CHUNK_SIZE, fmt=args.format,
+                                 start=start, stop=stop)
+    elif args.fit is None:
+        packed = iter_packed(uuid, timestamps, args.sort, DEFAULT_CHUNK_SIZE, start, stop)
+        chunks = (encode_packed(chunk, args.format) for chunk in packed)
+    else:
+        from uuidtool.commands.edit import iter_times
+        # The order of a model can't be sought, so the timestamps before the checkpoint or shard are skipped
+        ordered = islice(fit_model(args.fit, timestamps.step).order(timestamps, args.sort), start, stop)
+        uuids = iter_times(uuid, ordered)
+        packed = iter(lambda: b"".join(uuid.bytes for uuid in islice(uuids, DEFAULT_CHUNK_SIZE)), b"")
+        chunks = (encode_packed(chunk, args.format) for chunk in packed)
+    
+    # What was written after the checkpoint was saved is overwritten, so nothing is written twice
+    with Output(args.output, append_at=checkpoint.written if args.resume else None) as out:
+        position = start
+        for chunk in chunks:
+            out.write(chunk)
+            if checkpoint is not None:
+                position = min(position + DEFAULT_CHUNK_SIZE, stop)
+                out.flush()
+                checkpoint = checkpoint._replace(position=position, written=out.size)
+                checkpoint.save(args.checkpoint)
 
 
 if __name__ == "__main__":
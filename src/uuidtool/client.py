@@ -0,0 +1,57 @@
+import os, sys
+
+# This module is imported before any command runs, so it must stay cheap to import
+
+SOCKET_ENV = "UUIDTOOL_SOCKET"
+
+# Commands reading stdin, running for long or already using every core gain nothing from a warm process
+LOCAL_COMMANDS = {"serve", "probe", "crack", "analyze", "bench", "index"}
+
+
+def can_forward(argv: "list[str]") -> bool:
+    """Check if a command can be answered by a uuidtool serve process
+
+    :param argv: The arguments of the command, like sys.argv[1:]
+    """
+
+    return bool(argv) and argv[0] not in LOCAL_COMMANDS and "-" not in argv
+
+
+def forward(socket_path: str, argv: "list[str]") -> "int | None":
+    """Run a command through a uuidtool serve process, copying its output as it is streamed
+
+    :param socket_path: Unix socket of the process
+    :param argv: The arguments of the command, like sys.argv[1:]
+    :return: The exit code of the command, or None if the process is not reachable
+    """
+
+    import json, socket
+    
+    request = json.dumps({"argv": argv, "cwd": os.getcwd()}).encode() + b"\n"
+    streams = {b"1": sys.stdout, b"2": sys.stderr}
+    received = False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall(request)
+            with sock.makefile("rb") as f:
+                while True:
+                    header = f.readline().split()
+                    if len(header) == 2 and header[0] == b"exit":
+                        return int(header[1])
+                    stream, size = streams[header[0]], int(header[1])
+                    data = f.read(size)
+                    if len(data) != size:
+                        raise ValueError("Truncated response")
+                    received = True
+                    stream.buffer.write(data)
+                    stream.flush()
+    except BrokenPipeError:
+        raise  # The reader of our own output went away
+    except (AttributeError, OSError, ValueError, KeyError, IndexError):
+        # No Unix sockets on this platform, no server, or an invalid response
+        if not received:
+            return None
+        # Running the command again would repeat what was already written
+        print("Lost the connection to the uuidtool server", file=sys.stderr)
+        return 1
@@ -0,0 +1,161 @@
+from math import gcd
+from typing import Iterable, NamedTuple
+
+from uuidtool.commands.info import decode, format_node
+from uuidtool.utils import *
+
+PROFILE_OUTPUT = """{RED}Version: {version}{RESET}
+Samples: {samples}
+{GREEN}Effective tick: {tick_ns} ns ({ticks}x the clock tick){RESET}
+{GREEN}Phase: {phase_ns} ns{RESET}
+{CYAN}Fixed low bits: {fixed_bits}{fixed_value}{RESET}
+{MAGENTA}Clock Sequence: {clock_seq}{RESET}
+{BLUE}Node: {node}{RESET}"""
+
+
+class ClockProfile(NamedTuple):
+    """Clock behavior of a UUID generator, inferred from a sample of its UUIDs by analyze.
+    Timestamps of the generator are all congruent to phase_ns modulo tick_ns"""
+    version: int
+    samples: int
+    tick_ns: int
+    phase_ns: int
+    fixed_bits: int
+    fixed_value: int
+    clock_seq: "int | None" = None
+    clock_seqs: int = 0
+    node: "int | None" = None
+    nodes: int = 0
+
+    @classmethod
+    def from_dict(cls, profile: dict) -> "ClockProfile":
+        """Load a profile, like the JSON output of the analyze command
+
+        :param profile: The fields of the profile
+        """
+
+        try:
+            profile = cls(**profile)
+        except TypeError as e:
+            raise UUIDToolError(f"Invalid profile: {e}")
+
+        for field in ("version", "samples", "tick_ns", "phase_ns", "fixed_bits", "fixed_value"):
+            if not isinstance(getattr(profile, field), int):
+                raise UUIDToolError(f"Invalid profile: {field} must be an integer")
+
+        bounds = get_time_bounds(profile.version)
+        if bounds is None:
+            raise UUIDToolError(f"Invalid profile: UUID version {profile.version} has no timestamp")
+        if profile.tick_ns <= 0 or profile.tick_ns % bounds[0] != 0:
+            raise UUIDToolError(f"Invalid profile: tick_ns must be a positive multiple of {bounds[0]}")
+
+        return profile
+
+    def check(self, version: int):
+        """Check that the profile can be used with UUIDs of a given version
+
+        :param version: The UUID version
+        """
+
+        if version != self.version:
+            raise UUIDToolError(f"This profile was made from UUIDs version {self.version}, it can't be used with version {version}")
+
+    def align(self, timestamp: int) -> int:
+        """Get the first timestamp the generator can produce at or after a given timestamp
+
+        :param timestamp: The timestamp in nanoseconds
+        """
+
+        return timestamp + (self.phase_ns - timestamp) % self.tick_ns
+
+
+def analyze(uuids: "Iterable[str | UUID]") -> ClockProfile:
+    """Infer the clock behavior of a UUID generator from a sample of its UUIDs.
+    The effective tick is the GCD of the gaps between the sampled timestamps, so the more samples,
+    the more accurate it is. range and sandwich can use the profile to skip timestamps the
+    generator can never produce
+
+    :param uuids: The sampled UUIDs, they must all have the same version
+    """
+
+    fields = [decode(uuid) for uuid in uuids]
+    if not fields:
+        raise UUIDToolError("At least one UUID is required to analyze a generator")
+
+    version = fields[0].version
+    for f in fields:
+        if f.version != version:
+            raise UUIDToolError(f"All sampled UUIDs must have the same version ({version} and {f.version})")
+
+    bounds = get_time_bounds(version)
+    if bounds is None:
+        raise UUIDToolError(f"UUID version {version} has no timestamp, so its clock can't be analyzed")
+    clock_tick, lowest, _ = bounds
+
+    # Timestamps as stored in the UUID, in clock ticks since the epoch of the version
+    ticks = [(f.timestamp_ns - lowest) // clock_tick for f in fields]
+
+    step = 0
+    changed_bits = 0
+    for t in ticks:
+        step = gcd(step, t - ticks[0])
+        changed_bits |= t ^ ticks[0]
+
+    # With a single distinct timestamp, nothing can be inferred
+    step = step or 1
+    fixed_bits = (changed_bits & -changed_bits).bit_length() - 1 if changed_bits else 0
+
+    tick_ns = step * clock_tick
+    clock_seqs = {f.clock_seq for f in fields}
+    nodes = {f.node for f in fields}
+
+    return ClockProfile(
+        version=version,
+        samples=len(fields),
+        tick_ns=tick_ns,
+        phase_ns=fields[0].timestamp_ns % tick_ns,
+        fixed_bits=fixed_bits,
+        fixed_value=ticks[0] & ((1 << fixed_bits) - 1),
+        clock_seq=next(iter(clock_seqs)) if len(clock_seqs) == 1 else None,
+        clock_seqs=len(clock_seqs) if None not in clock_seqs else 0,
+        node=next(iter(nodes)) if len(nodes) == 1 else None,
+        nodes=len(nodes) if None not in nodes else 0,
+    )
+
+
+def format_profile(profile: ClockProfile) -> str:
+    """Format a profile for humans
+
+    :param profile: The profile to format
+    """
+
+    clock_tick = get_time_bounds(profile.version)[0]
+
+    if profile.fixed_bits:
+        fixed_value = f" (always {profile.fixed_value:0{profile.fixed_bits}b})"
+    else:
+        fixed_value = ""
+
+    return PROFILE_OUTPUT.format(
+        **ALL_COLORS,
+        version=profile.version,
+        samples=profile.samples,
+        tick_ns=profile.tick_ns,
+        ticks=profile.tick_ns // clock_tick,
+        phase_ns=profile.phase_ns,
+        fixed_bits=profile.fixed_bits,
+        fixed_value=fixed_value,
+        clock_seq=_behavior(profile.clock_seq, profile.clock_seqs, profile.samples),
+        node=_behavior(profile.node if profile.node is None else format_node(profile.node), profile.nodes, profile.samples),
+    )
+
+
+def _behavior(value, distinct: int, samples: int) -> str:
+
+    if distinct == 0:
+        return "Not applicable"
+    elif distinct == 1:
+        return f"Constant ({value})"
+    elif distinct == samples:
+        return "Different for every UUID"
+    return f"Varies ({distinct} distinct values)"
@@ -0,0 +1,185 @@
+import platform, time, tracemalloc
+from collections import deque
+from typing import Callable, Iterable
+
+from uuidtool.batch import iter_packed, np
+from uuidtool.commands.crack import crack
+from uuidtool.commands.edit import edit_many, edit_uuid, set_time
+from uuidtool.commands.info import decode, info
+from uuidtool.commands.new import new_uuids
+from uuidtool.commands.range import iter_range, range_timestamps
+from uuidtool.commands.sandwich import iter_sandwich
+from uuidtool.utils import *
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+V1_UUID = UUID("e63034d3-acc1-11ef-8aaf-e63af2894db7")
+SAMPLE_UUIDS = (
+    "e63034d3-acc1-11ef-8aaf-e63af2894db7",
+    "000003e8-acc2-21ef-b100-e63af2894db7",
+    "013a3dd2-e0e8-5595-891b-2135ce7321c3",
+    "ee505478-a4fc-4c7d-9361-10f6a261f404",
+    "1efacc1e-6303-64d3-8aaf-e63af2894db7",
+    "01936dc5-a16a-7d24-b038-dd8b3e962c8c",
+    "00000000-0abc-89ac-8f21-8e3d2c3cabd3",
+)
+
+
+def bench(sizes: Iterable[int] = DEFAULT_SIZES, repeat: int = 3, only: "list[str]" = None) -> dict:
+    """Measure the throughput and peak memory of the hot path of every command
+
+    :param sizes: Number of UUIDs handled by each run
+    :param repeat: Number of timed runs, the fastest one is kept
+    :param only: Names (or prefixes of names) of the benchmarks to run, all by default
+    """
+
+    if repeat < 1:
+        raise UUIDToolError(f"Repeat must be at least 1, got {repeat}")
+
+    results = []
+    for name, workload in BENCHMARKS.items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        for size in sizes:
+            if size < 2:
+                raise UUIDToolError(f"Benchmark sizes must be greater than 1, got {size}")
+            results.append(run_benchmark(name, workload, size, repeat))
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "numpy": np.__version__ if np is not None else None,
+        "results": results,
+    }
+
+
+def run_benchmark(name: str, workload: Callable[[int], None], size: int, repeat: int) -> dict:
+    """Run a single benchmark
+
+    :param name: The name of the benchmark
+    :param workload: Function handling the given number of UUIDs
+    :param size: Number of UUIDs to handle
+    :param repeat: Number of timed runs, the fastest one is kept
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        workload(size)
+        best = min(best, time.perf_counter() - start)
+
+    # Tracing allocations slows everything down, so memory is measured in a separate run
+    tracemalloc.start()
+    try:
+        workload(size)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "name": name,
+        "size": size,
+        "seconds": best,
+        "per_second": size / best if best > 0 else None,
+        "peak_memory_bytes": peak,
+    }
+
+
+def compare(baseline: dict, current: dict) -> "list[dict]":
+    """Compare the results of 2 runs of bench, for example between 2 versions of uuidtool
+
+    :param baseline: The results to compare against
+    :param current: The new results
+    """
+
+    baseline_results = {(r["name"], r["size"]): r for r in baseline["results"]}
+    comparison = []
+    for result in current["results"]:
+        old = baseline_results.get((result["name"], result["size"]))
+        if old is None:
+            continue
+        comparison.append({
+            "name": result["name"],
+            "size": result["size"],
+            "speedup": old["seconds"] / result["seconds"] if result["seconds"] > 0 else None,
+            "memory_ratio": result["peak_memory_bytes"] / old["peak_memory_bytes"] if old["peak_memory_bytes"] > 0 else None,
+        })
+
+    return comparison
+
+
+def _consume(iterable: Iterable):
+    deque(iterable, maxlen=0)
+
+
+def _new(version: int, **kwargs) -> Callable[[int], None]:
+    return lambda size: _consume(new_uuids(size, version, **kwargs))
+
+
+def _edit(size: int):
+    for t in range(size):
+        edit_uuid(V1_UUID, timestamp_ns=t * 100, node="11:22:33:44:55:66")
+
+
+def _edit_many(size: int):
+    _consume(edit_many((SAMPLE_UUIDS[0] for _ in range(size)), timestamp_ns=0, node="11:22:33:44:55:66"))
+
+
+def _info(size: int):
+    for i in range(size):
+        info(SAMPLE_UUIDS[i % len(SAMPLE_UUIDS)])
+
+
+def _decode(size: int):
+    for i in range(size):
+        decode(SAMPLE_UUIDS[i % len(SAMPLE_UUIDS)])
+
+
+def _parse(size: int):
+    for i in range(size):
+        get_uuid(SAMPLE_UUIDS[i % len(SAMPLE_UUIDS)])
+
+
+def _crack(size: int):
+    # The v5 sample UUID is not in the wordlist, so every word is hashed
+    crack([SAMPLE_UUIDS[2]], (f"user{i}" for i in range(size)), ["@dns"])
+
+
+def _range(sort: str) -> Callable[[int], None]:
+    return lambda size: _consume(iter_range(V1_UUID, size, sort))
+
+
+def _range_packed(size: int):
+    _consume(iter_packed(V1_UUID, range_timestamps(V1_UUID, size), "alt"))
+
+
+def _sandwich(sort: str) -> Callable[[int], None]:
+    def workload(size: int):
+        # 2 v1 UUIDs whose timestamps are size + 1 ticks apart, so size UUIDs are between them
+        other = set_time(V1_UUID, get_timestamp(V1_UUID) + (size + 1) * 100)
+        _consume(iter_sandwich(V1_UUID, other, sort))
+    return workload
+
+
+BENCHMARKS = {
+    "new-v1": _new(1),
+    "new-v2": _new(2),
+    "new-v3": _new(3, namespace="@dns", name="example.com"),
+    "new-v4": _new(4),
+    "new-v5": _new(5, namespace="@dns", name="example.com"),
+    "new-v6": _new(6),
+    "new-v7": _new(7),
+    "new-v8": _new(8),
+    "edit": _edit,
+    "edit-many": _edit_many,
+    "parse": _parse,
+    "decode": _decode,
+    "info": _info,
+    "crack": _crack,
+    "range-asc": _range("asc"),
+    "range-alt": _range("alt"),
+    "range-packed": _range_packed,
+    "sandwich-asc": _sandwich("asc"),
+    "sandwich-alt": _sandwich("alt"),
+}
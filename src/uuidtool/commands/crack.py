@@ -0,0 +1,179 @@
+import hashlib, time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, NamedTuple
+
+from uuidtool.commands.new import namespaces
+from uuidtool.utils import *
+
+DEFAULT_CHUNK_SIZE = 8192
+
+PLACEHOLDER = "{word}"
+
+RULES = {
+    "none": lambda word: word,
+    "lower": bytes.lower,
+    "upper": bytes.upper,
+    "capitalize": bytes.capitalize,
+    "title": bytes.title,
+    "reverse": lambda word: word[::-1],
+}
+
+
+class CrackResult(NamedTuple):
+    """Result of a crack run"""
+    matches: "list[tuple[UUID, str, str]]"
+    hashes: int
+    seconds: float
+
+    @property
+    def per_second(self) -> float:
+        return self.hashes / self.seconds if self.seconds > 0 else 0.0
+
+
+def crack(targets: "Iterable[str | UUID]", words: "Iterable[str | bytes]", namespace_candidates: "list[str]" = None,
+          rules: "list[str]" = None, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+          on_match: "Callable[[UUID, str, str], None]" = None) -> CrackResult:
+    """Find the names (and namespaces) of version 3 and 5 UUIDs from a wordlist.
+    Stops as soon as every target is found
+
+    :param targets: The UUIDs to crack, version 3 or 5
+    :param words: The candidate names, like the lines of a wordlist
+    :param namespace_candidates: The namespaces to try, UUIDs or @dns, @url, @oid, @x500. Defaults to the 4 of them
+    :param rules: The mangling rules applied to each word: a name from RULES or a template containing {word}, like
+    {word}@example.com. Defaults to none (the word as is)
+    :param workers: Number of processes
+    :param chunk_size: Number of words hashed by a process at once
+    :param on_match: Function called with (uuid, namespace, name) for each match
+    """
+
+    targets = [get_uuid(target) for target in targets]
+    if not targets:
+        raise UUIDToolError("At least one UUID to crack is required")
+    for target in targets:
+        if get_version(target) not in (3, 5):
+            raise UUIDToolError(f"Only UUID versions 3 and 5 can be cracked, {target} is version {get_version(target)}")
+
+    namespace_candidates = list(namespace_candidates or namespaces)
+    for namespace in namespace_candidates:
+        if not is_uuid(namespace) and namespace not in namespaces:
+            raise UUIDToolError(f"Invalid namespace: Expected a UUID or one of {namespaces.keys()}, got {namespace}")
+
+    rules = list(rules or ["none"])
+    for rule in rules:
+        if rule not in RULES and PLACEHOLDER not in rule:
+            raise UUIDToolError(f"Invalid rule: Expected one of {', '.join(RULES)} or a template containing {PLACEHOLDER}, got {rule}")
+
+    if not isinstance(workers, int) or workers < 1:
+        raise UUIDToolError(f"Number of workers must be at least 1, got {workers}")
+    if chunk_size < 1:
+        raise UUIDToolError(f"Chunk size must be at least 1, got {chunk_size}")
+
+    state = (tuple(targets), tuple(namespace_candidates), tuple(rules))
+    words = (word.encode() if isinstance(word, str) else word for word in words)
+    chunks = iter(lambda: list(islice(words, chunk_size)), [])
+
+    remaining = set(targets)
+    matches = []
+    hashes = 0
+    start = time.perf_counter()
+
+    def collect(result: "tuple[list, int]"):
+        nonlocal hashes
+        found, count = result
+        hashes += count
+        for target, namespace, name in found:
+            if target in remaining:
+                remaining.discard(target)
+                matches.append((target, namespace, name))
+                if on_match is not None:
+                    on_match(target, namespace, name)
+
+    if workers == 1:
+        cracker = _Cracker(*state)
+        for chunk in chunks:
+            collect(cracker(chunk))
+            if not remaining:
+                break
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=state) as pool:
+            # Only a few chunks are in flight, so the wordlist is streamed instead of being loaded at once
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_crack_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    collect(pending.popleft().result())
+                    if not remaining:
+                        break
+            for future in pending:
+                if remaining:
+                    collect(future.result())
+                else:
+                    future.cancel()
+
+    return CrackResult(matches, hashes, time.perf_counter() - start)
+
+
+class _Cracker:
+    """Hash words against every namespace, with hashers already primed with the namespace bytes"""
+
+    def __init__(self, targets: "tuple[UUID]", namespace_candidates: "tuple[str]", rules: "tuple[str]"):
+
+        versions = {get_version(target) for target in targets}
+        self.seeds = []
+        for namespace in namespace_candidates:
+            namespace_bytes = (UUID(namespace) if is_uuid(namespace) else namespaces[namespace]).bytes
+            if 3 in versions:
+                self.seeds.append((namespace, 3, hashlib.md5(namespace_bytes)))
+            if 5 in versions:
+                self.seeds.append((namespace, 5, hashlib.sha1(namespace_bytes)))
+
+        # The first 6 bytes of a name-based UUID are the first 6 bytes of the digest
+        self.prefixes = {}
+        for target in targets:
+            self.prefixes.setdefault(target.bytes[:6], []).append(target)
+
+        self.rules = []
+        for rule in rules:
+            if rule in RULES:
+                self.rules.append(RULES[rule])
+            else:
+                prefix, _, suffix = rule.encode().partition(PLACEHOLDER.encode())
+                self.rules.append(lambda word, prefix=prefix, suffix=suffix: prefix + word + suffix)
+
+    def __call__(self, words: "list[bytes]") -> "tuple[list[tuple[UUID, str, str]], int]":
+
+        prefixes = self.prefixes
+        found = []
+        hashes = 0
+
+        for word in words:
+            word = word.rstrip(b"\r\n")
+            if not word:
+                continue
+            names = dict.fromkeys(rule(word) for rule in self.rules)
+            for namespace, version, seed in self.seeds:
+                for name in names:
+                    hasher = seed.copy()
+                    hasher.update(name)
+                    digest = hasher.digest()
+                    if digest[:6] in prefixes:
+                        uuid = UUID(bytes=name_based_bytes(digest, version))
+                        if uuid in prefixes[digest[:6]]:
+                            found.append((uuid, namespace, name.decode(errors="replace")))
+            hashes += len(names) * len(self.seeds)
+
+        return found, hashes
+
+
+_cracker = None
+
+def _init_worker(targets: "tuple[UUID]", namespace_candidates: "tuple[str]", rules: "tuple[str]"):
+
+    global _cracker
+    _cracker = _Cracker(targets, namespace_candidates, rules)
+
+
+def _crack_chunk(words: "list[bytes]") -> "tuple[list[tuple[UUID, str, str]], int]":
+    return _cracker(words)
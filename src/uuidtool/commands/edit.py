@@ -1,3 +1,5 @@
+import sys
+from typing import Iterable, Iterator
 from uuid import UUID
 
 from uuidtool.utils import *
@@ -61,6 +63,150 @@ def edit_uuid(uuid: "str | UUID", timestamp_ns: int=None, clock_seq: int=None, n
         uuid = set_custom_c(uuid, custom_c)
             
     return uuid
+
+
+class EditPlan:
+    """Field edits for UUIDs of a given version, compiled into a single AND mask and OR value,
+    so that editing a UUID is (uuid.int & and_mask) | or_value instead of a chain of set_* calls.
+    Edits don't depend on the other bits of a UUID, so they are found by editing a UUID with
+    every other bit set and one with every other bit cleared"""
+
+    def __init__(self, version: int, timestamp_ns: int=None, clock_seq: int=None, node: str=None, local_id: int=None,
+                 local_domain: int=None, custom_a: str=None, custom_b: str=None, custom_c: str=None):
+        """
+        :param version: The version of the UUIDs to edit
+        :param timestamp_ns: Timestamp in nanoseconds
+        :param clock_seq: The clock sequence
+        :param node: The node (mac address)
+        :param local_id: The local id
+        :param local_domain: The local domain 
+        :param custom_a: The custom field A
+        :param custom_b: The custom field B
+        :param custom_c: The custom field C
+        """
+        
+        fields = (timestamp_ns, clock_seq, node, local_id, local_domain, custom_a, custom_b, custom_c)
+        version_bits = version << 76
+        
+        ones = edit_uuid(UUID(int=((1 << 128) - 1) ^ (0xf << 76) | version_bits), *fields).int
+        zeros = edit_uuid(UUID(int=version_bits), *fields).int
+        
+        self.version = version
+        self.and_mask = ones ^ zeros
+        self.or_value = zeros
+
+    def apply_int(self, uuid_int: int) -> int:
+        """Edit a UUID given as a 128 bits integer
+
+        :param uuid_int: The UUID to edit, it must have the version of the plan
+        """
+        
+        return (uuid_int & self.and_mask) | self.or_value
+
+    def apply(self, uuid: "str | UUID") -> UUID:
+        """Edit a UUID
+
+        :param uuid: The UUID to edit, it must have the version of the plan
+        """
+        
+        uuid = get_uuid(uuid)
+        if get_version(uuid) != self.version:
+            raise UUIDToolError(f"This plan edits UUIDs version {self.version}, not {get_version(uuid)}")
+        
+        return UUID(int=(uuid.int & self.and_mask) | self.or_value)
+
+    def apply_times(self, uuid: "str | UUID", timestamps: Iterable[int]) -> Iterator[UUID]:
+        """Lazily edit a UUID, then give it each of the timestamps, like range and sandwich do
+
+        :param uuid: The UUID to edit, it must have the version of the plan
+        :param timestamps: The timestamps in nanoseconds
+        """
+        
+        return iter_times(self.apply(uuid), timestamps)
+
+    def apply_packed(self, buffer: "bytes | bytearray") -> bytearray:
+        """Edit packed UUIDs (see batch.pack_timestamps), in a single vectorized operation with NumPy.
+        Only UUIDs with the version of the plan are edited
+
+        :param buffer: The packed UUIDs
+        :return: The edited packed UUIDs
+        """
+        
+        from uuidtool.batch import np
+        
+        out = bytearray(buffer)
+        
+        if np is not None:
+            view = np.frombuffer(out, dtype=">u8").reshape(-1, 2)
+            rows = ((view[:, 0] >> 12) & 0xf) == self.version
+            view[rows, 0] = (view[rows, 0] & np.uint64(self.and_mask >> 64)) | np.uint64(self.or_value >> 64)
+            view[rows, 1] = (view[rows, 1] & np.uint64(self.and_mask & 0xffffffff_ffffffff)) | np.uint64(self.or_value & 0xffffffff_ffffffff)
+            return out
+        
+        for i in range(0, len(out), 16):
+            uuid_int = int.from_bytes(out[i:i + 16], "big")
+            if (uuid_int >> 76) & 0xf == self.version:
+                out[i:i + 16] = ((uuid_int & self.and_mask) | self.or_value).to_bytes(16, "big")
+        return out
+
+
+def edit_many(uuids: "Iterable[str | UUID]", timestamp_ns: int=None, clock_seq: int=None, node: str=None,
+              local_id: int=None, local_domain: int=None, custom_a: str=None, custom_b: str=None, custom_c: str=None,
+              skip_invalid: bool = False) -> Iterator[UUID]:
+    """Lazily apply the same edits to many UUIDs, like the lines of a file. Field values are parsed once and
+    compiled once per version (see EditPlan), so editing a UUID is a single mask and OR. Empty lines are ignored
+
+    :param uuids: The UUIDs to edit
+    :param timestamp_ns: Timestamp in nanoseconds
+    :param clock_seq: The clock sequence
+    :param node: The node (mac address)
+    :param local_id: The local id
+    :param local_domain: The local domain 
+    :param custom_a: The custom field A
+    :param custom_b: The custom field B
+    :param custom_c: The custom field C
+    :param skip_invalid: Report invalid UUIDs (and UUIDs whose version doesn't have an edited field) on stderr
+    with their line number and skip them, instead of raising an error
+    """
+    
+    # Fail early on invalid values, before reading any UUID
+    get_int(node, f"Invalid node: {node}", 16)
+    get_int(custom_a, f"Invalid custom A: {custom_a}", 16)
+    get_int(custom_b, f"Invalid custom B: {custom_b}", 16)
+    get_int(custom_c, f"Invalid custom C: {custom_c}", 16)
+    
+    fields = (timestamp_ns, clock_seq, node, local_id, local_domain, custom_a, custom_b, custom_c)
+    plans = {}
+    
+    def compiled(version: int) -> EditPlan:
+        if version not in plans:
+            try:
+                plans[version] = EditPlan(version, *fields)
+            except UUIDToolError as e:
+                plans[version] = e
+        if isinstance(plans[version], UUIDToolError):
+            raise plans[version]
+        return plans[version]
+    
+    def generate():
+        for line_number, uuid in enumerate(uuids, 1):
+            try:
+                if isinstance(uuid, UUID):
+                    uuid_int = uuid.int
+                else:
+                    uuid = uuid.strip()
+                    if not uuid:
+                        continue
+                    uuid_int = parse_uuid(uuid)
+                plan = compiled((uuid_int >> 76) & 0xf)
+            except UUIDToolError as e:
+                if not skip_invalid:
+                    raise
+                print(f"Line {line_number}:", *e.args, file=sys.stderr)
+                continue
+            yield UUID(int=(uuid_int & plan.and_mask) | plan.or_value)
+    
+    return generate()
     
     
 
@@ -72,44 +218,63 @@ def set_time(uuid: UUID, new_time_ns: int) -> UUID:
     """
 
     version = get_version(uuid)
-        
-    uuid_int = uuid.int
-        
-    if version == 1:
-        timestamp = new_time_ns // 100 + GREGORIAN_UNIX_OFFSET // 100
-        time_low = timestamp & 0xffffffff
-        time_mid = (timestamp >> 32) & 0xffff
-        time_high = (timestamp >> 48) & 0x0fff
-        
-        uuid_int &= 0x00000000_0000_f000_ffff_ffffffffffff
-        uuid_int |= (time_low << 96) | (time_mid << 80) | (time_high << 64)
-                
-    elif version == 2:
-        timestamp = new_time_ns + GREGORIAN_UNIX_OFFSET
-        timestamp = timestamp // V2_CLOCK_TICK
-        time_low = timestamp & 0xffff
-        time_high = (timestamp >> 16) & 0x0fff
-                    
-        uuid_int &= 0xffffffff_0000_f000_ffff_ffffffffffff
-        uuid_int |= (time_low << 80) | (time_high << 64)
-                
-    elif version == 6:
-        timestamp = new_time_ns // 100 + GREGORIAN_UNIX_OFFSET // 100
-        timestamp = ((timestamp >> 12) << 16) | (timestamp & 0xfff)
-        
-        uuid_int &= 0x00000000_000_f000_ffff_ffffffffffff
-        uuid_int |= timestamp << 64
-                
-    elif version == 7:
-        timestamp = new_time_ns // 1_000_000
-        
-        uuid_int &= 0x00000000_000_ffff_ffff_ffffffffffff
-        uuid_int |= timestamp << 80
-        
-    else:
+    
+    if version not in TIME_FIELDS:
         raise UUIDToolError(f"Time is not supported for UUID version {version}")
+    
+    time_mask, time_bits = TIME_FIELDS[version]
                     
-    return UUID(int=uuid_int)
+    return UUID(int=(uuid.int & time_mask) | time_bits(new_time_ns))
+
+
+def iter_times(uuid: UUID, timestamps: Iterable[int]) -> Iterator[UUID]:
+    """Lazily give a UUID each of the timestamps, like set_time but the version is only checked once
+
+    :param uuid: The UUID to set the time for
+    :param timestamps: The timestamps in nanoseconds
+    """
+    
+    version = get_version(uuid)
+    
+    if version not in TIME_FIELDS:
+        raise UUIDToolError(f"Time is not supported for UUID version {version}")
+    
+    time_mask, time_bits = TIME_FIELDS[version]
+    base = uuid.int & time_mask
+    
+    return (UUID(int=base | time_bits(t)) for t in timestamps)
+
+
+def _v1_time_bits(new_time_ns: int) -> int:
+    timestamp = new_time_ns // 100 + GREGORIAN_UNIX_OFFSET // 100
+    time_low = timestamp & 0xffffffff
+    time_mid = (timestamp >> 32) & 0xffff
+    time_high = (timestamp >> 48) & 0x0fff
+    return (time_low << 96) | (time_mid << 80) | (time_high << 64)
+
+def _v2_time_bits(new_time_ns: int) -> int:
+    timestamp = new_time_ns + GREGORIAN_UNIX_OFFSET
+    timestamp = timestamp // V2_CLOCK_TICK
+    time_low = timestamp & 0xffff
+    time_high = (timestamp >> 16) & 0x0fff
+    return (time_low << 80) | (time_high << 64)
+
+def _v6_time_bits(new_time_ns: int) -> int:
+    timestamp = new_time_ns // 100 + GREGORIAN_UNIX_OFFSET // 100
+    timestamp = ((timestamp >> 12) << 16) | (timestamp & 0xfff)
+    return timestamp << 64
+
+def _v7_time_bits(new_time_ns: int) -> int:
+    timestamp = new_time_ns // 1_000_000
+    return timestamp << 80
+
+# Per version: (mask clearing the timestamp, function giving the bits of a timestamp in nanoseconds)
+TIME_FIELDS = {
+    1: (0x00000000_0000_f000_ffff_ffffffffffff, _v1_time_bits),
+    2: (0xffffffff_0000_f000_ffff_ffffffffffff, _v2_time_bits),
+    6: (0x00000000_0000_f000_ffff_ffffffffffff, _v6_time_bits),
+    7: (0x00000000_0000_ffff_ffff_ffffffffffff, _v7_time_bits),
+}
 
 
 
@@ -0,0 +1,216 @@
+import heapq, hashlib, mmap, os, struct, tempfile
+from typing import Iterable, Iterator
+
+from uuidtool.commands.new import namespaces
+from uuidtool.utils import *
+
+MAGIC = b"UUIDIDX1"
+
+# Magic, number of namespaces, length of the wordlist path, number of records
+HEADER = struct.Struct("<8sIIQ")
+
+# UUID, then the namespace number (high 8 bits) and the offset of the name in the wordlist (low 56 bits)
+RECORD = struct.Struct(">16sQ")
+
+DEFAULT_RUN_SIZE = 1 << 19
+
+
+def build_index(wordlist: str, path: str, namespace_candidates: "list[str]" = None, versions: Iterable[int] = (3, 5),
+                run_size: int = DEFAULT_RUN_SIZE) -> int:
+    """Compute the version 3 and 5 UUIDs of every name of a wordlist and store them in a sorted index,
+    to look them up later without hashing again, see NameIndex. The index is sorted by runs that are
+    merged on disk, so memory usage does not depend on the size of the wordlist
+
+    :param wordlist: Path of the wordlist, one name per line
+    :param path: Path of the index to write
+    :param namespace_candidates: The namespaces, UUIDs or @dns, @url, @oid, @x500. Defaults to the 4 of them
+    :param versions: The UUID versions to compute, 3 and/or 5
+    :param run_size: Number of records sorted in memory at once
+    :return: The number of records in the index
+    """
+
+    namespace_candidates = list(namespace_candidates or namespaces)
+    if len(namespace_candidates) > 256:
+        raise UUIDToolError(f"An index can have at most 256 namespaces, got {len(namespace_candidates)}")
+    for namespace in namespace_candidates:
+        if not is_uuid(namespace) and namespace not in namespaces:
+            raise UUIDToolError(f"Invalid namespace: Expected a UUID or one of {namespaces.keys()}, got {namespace}")
+    namespace_uuids = [UUID(namespace) if is_uuid(namespace) else namespaces[namespace]
+                       for namespace in namespace_candidates]
+
+    versions = sorted(set(versions))
+    if not versions or any(version not in (3, 5) for version in versions):
+        raise UUIDToolError(f"Versions must be 3 and/or 5, got {versions}")
+    if run_size < 1:
+        raise UUIDToolError(f"Run size must be at least 1, got {run_size}")
+
+    seeds = []
+    for i, namespace in enumerate(namespace_uuids):
+        for version in versions:
+            hasher = hashlib.md5 if version == 3 else hashlib.sha1
+            seeds.append((i << 56, version, hasher(namespace.bytes)))
+
+    wordlist_path = os.path.abspath(wordlist).encode()
+
+    try:
+        with open(wordlist, "rb") as words, tempfile.TemporaryDirectory() as tmp:
+            runs = []
+            count = 0
+            for run in _iter_runs(_iter_records(words, seeds), run_size):
+                count += len(run)
+                run_path = os.path.join(tmp, str(len(runs)))
+                with open(run_path, "wb") as f:
+                    f.write(b"".join(run))
+                runs.append(run_path)
+
+            with open(path, "wb") as out:
+                header = HEADER.pack(MAGIC, len(namespace_uuids), len(wordlist_path), count)
+                header += b"".join(namespace.bytes for namespace in namespace_uuids) + wordlist_path
+                out.write(header + b"\0" * (-len(header) % RECORD.size))
+
+                files = [open(run_path, "rb") for run_path in runs]
+                try:
+                    readers = [iter(lambda f=f: f.read(RECORD.size), b"") for f in files]
+                    out.writelines(heapq.merge(*readers))
+                finally:
+                    for f in files:
+                        f.close()
+    except OSError as e:
+        raise UUIDToolError(f"Cannot build the index: {e.strerror or e}")
+
+    return count
+
+
+class NameIndex:
+    """Look up version 3 and 5 UUIDs in an index written by build_index.
+    The index and the wordlist are memory mapped and binary searched, so they are never loaded in memory"""
+
+    def __init__(self, path: str, wordlist: str = None):
+        """
+        :param path: Path of the index
+        :param wordlist: Path of the wordlist, defaults to the one the index was built from
+        """
+
+        self._files = []
+        try:
+            self.index = self._map(path)
+            if len(self.index) < HEADER.size:
+                raise UUIDToolError(f"{path} is not a UUID index")
+
+            magic, namespace_count, path_length, self.count = HEADER.unpack_from(self.index)
+            if magic != MAGIC:
+                raise UUIDToolError(f"{path} is not a UUID index")
+
+            start = HEADER.size
+            self.namespaces = [UUID(bytes=self.index[start + 16 * i:start + 16 * (i + 1)]) for i in range(namespace_count)]
+            start += 16 * namespace_count
+            self.wordlist_path = self.index[start:start + path_length].decode()
+            start += path_length
+            self.start = start + (-start % RECORD.size)
+
+            if len(self.index) != self.start + self.count * RECORD.size:
+                raise UUIDToolError(f"{path} is truncated or corrupted")
+
+            self.words = self._map(wordlist or self.wordlist_path)
+        except OSError as e:
+            self.close()
+            raise UUIDToolError(f"Cannot open the index: {e.strerror or e}")
+        except UUIDToolError:
+            self.close()
+            raise
+
+        labels = {uuid: label for label, uuid in namespaces.items()}
+        self.labels = [labels.get(namespace, str(namespace)) for namespace in self.namespaces]
+
+    def lookup(self, uuid: "str | UUID") -> "list[tuple[str, str]]":
+        """Find the names (and namespaces) of a UUID
+
+        :param uuid: The UUID to look up
+        :return: The (namespace, name) pairs giving this UUID, empty if it is not in the index
+        """
+
+        key = get_uuid(uuid).bytes
+        index, start, size = self.index, self.start, RECORD.size
+
+        # Leftmost record whose key is not lower than the UUID
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            position = start + mid * size
+            if index[position:position + 16] < key:
+                low = mid + 1
+            else:
+                high = mid
+
+        found = []
+        while low < self.count:
+            record_key, value = RECORD.unpack_from(index, start + low * size)
+            if record_key != key:
+                break
+            found.append((self.labels[value >> 56], self._name(value & 0xffffffffffffff)))
+            low += 1
+
+        return found
+
+    def lookup_many(self, uuids: "Iterable[str | UUID]") -> "Iterator[tuple[UUID, list[tuple[str, str]]]]":
+        """Lazily look up many UUIDs, see lookup
+
+        :param uuids: The UUIDs to look up
+        """
+
+        return ((get_uuid(uuid), self.lookup(uuid)) for uuid in uuids)
+
+    def close(self):
+
+        for f in self._files:
+            f.close()
+        self._files = []
+
+    def __enter__(self) -> "NameIndex":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _map(self, path: str) -> "mmap.mmap | bytes":
+
+        with open(path, "rb") as f:
+            # Empty files can't be memory mapped
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._files.append(mapped)
+        return mapped
+
+    def _name(self, offset: int) -> str:
+
+        end = self.words.find(b"\n", offset)
+        name = self.words[offset:end if end != -1 else len(self.words)]
+        return name.rstrip(b"\r").decode(errors="replace")
+
+
+def _iter_records(words, seeds: list) -> Iterator[bytes]:
+
+    offset = 0
+    for line in words:
+        name = line.rstrip(b"\r\n")
+        if name:
+            for namespace, version, seed in seeds:
+                hasher = seed.copy()
+                hasher.update(name)
+                yield RECORD.pack(name_based_bytes(hasher.digest(), version), namespace | offset)
+        offset += len(line)
+
+
+def _iter_runs(records: Iterator[bytes], run_size: int) -> "Iterator[list[bytes]]":
+
+    run = []
+    for record in records:
+        run.append(record)
+        if len(run) >= run_size:
+            run.sort()
+            yield run
+            run = []
+    if run:
+        run.sort()
+        yield run
@@ -1,3 +1,6 @@
+import csv, json, sys
+from itertools import islice
+from typing import Iterable, Iterator, Literal, NamedTuple, TextIO
 from uuid import UUID
 from uuidtool.utils import *
 
@@ -6,36 +9,82 @@ OUTPUT_BASE = """UUID: {formatted_uuid}
 {YELLOW}Variant: {variant}{RESET}"""
 
 
-def info(uuid: "str | UUID"):
-    """Get information about a UUID
+class UUIDFields(NamedTuple):
+    """Parsed fields of a UUID. Fields that don't apply to the version of the UUID are None"""
+    uuid: UUID
+    version: int
+    variant: int
+    timestamp_ns: "int | None" = None
+    clock_seq: "int | None" = None
+    node: "int | None" = None
+    local_id: "int | None" = None
+    local_domain: "int | None" = None
+    custom_a: "int | None" = None
+    custom_b: "int | None" = None
+    custom_c: "int | None" = None
+
+
+def decode(uuid: "str | UUID") -> UUIDFields:
+    """Parse the fields of a UUID, without any formatting
     
-    :param str_uuid: The UUID to get information about
+    :param uuid: The UUID to parse
     """
     
     uuid = get_uuid(uuid)
+    uuid_int = uuid.int
     version = get_version(uuid)
     variant = get_variant(uuid)
+    
+    if version in (1, 6):
+        return UUIDFields(uuid, version, variant, get_timestamp(uuid),
+                          clock_seq=(uuid_int >> 48) & 0x3fff,
+                          node=uuid_int & 0xffffffffffff)
+    elif version == 2:
+        return UUIDFields(uuid, version, variant, get_timestamp(uuid),
+                          clock_seq=(uuid_int >> 56) & 0x3f,
+                          node=uuid_int & 0xffffffffffff,
+                          local_id=uuid_int >> 96,
+                          local_domain=(uuid_int >> 48) & 0xff)
+    elif version == 7:
+        return UUIDFields(uuid, version, variant, get_timestamp(uuid))
+    elif version == 8:
+        return UUIDFields(uuid, version, variant,
+                          custom_a=uuid_int >> 80,
+                          custom_b=(uuid_int >> 64) & 0x0fff,
+                          custom_c=uuid_int & ((1 << 62) - 1))
+    else:
+        return UUIDFields(uuid, version, variant)
+
+
+def info(uuid: "str | UUID"):
+    """Get information about a UUID
+    
+    :param str_uuid: The UUID to get information about
+    """
+    
+    fields = decode(uuid)
+    version = fields.version
 
     if version == 1:
-        ret = v1(uuid)
+        ret = v1(fields)
     elif version == 2:
-        ret = v2(uuid)
+        ret = v2(fields)
     elif version == 3:
-        ret = v3(uuid)
+        ret = v3(fields)
     elif version == 4:
-        ret = v4(uuid)
+        ret = v4(fields)
     elif version == 5:
-        ret = v5(uuid)
+        ret = v5(fields)
     elif version == 6:
-        ret = v6(uuid)
+        ret = v6(fields)
     elif version == 7:
-        ret = v7(uuid)
+        ret = v7(fields)
     elif version == 8:
-        ret = v8(uuid)
+        ret = v8(fields)
     else:
-        ret = other(uuid)
+        ret = other(fields)
         
-    if not 7 < variant < 12:
+    if not 7 < fields.variant < 12:
         ret = f"{YELLOW}{BOLD}Warning: This UUID is not compliant with RFC 9562, some information may be incorrect{RESET}\n" + ret
         
     return ret
@@ -46,9 +95,9 @@ V1_V6_OUTPUT = OUTPUT_BASE + """
 {MAGENTA}Clock Sequence: {clock}{RESET}
 {BLUE}Node: {node}{RESET}"""
 
-def v1(uuid: UUID):
+def v1(fields: UUIDFields):
     
-    s = str(uuid)
+    s = str(fields.uuid)
     formatted_uuid = (
         f"{GREEN}{s[:8]}{RESET}-"
         f"{GREEN}{s[9:13]}{RESET}-"
@@ -57,16 +106,15 @@ def v1(uuid: UUID):
         f"{BLUE}{s[24:]}{RESET}"
     )
     
-    uuid_time_ns = get_timestamp(uuid)
-    formatted_time = strftime(uuid_time_ns)
+    formatted_time = strftime(fields.timestamp_ns)
 
     return V1_V6_OUTPUT.format(
         **ALL_COLORS,
-        **get_common_info(uuid),
+        **get_common_info(fields),
         formatted_uuid=formatted_uuid,
         time=formatted_time,
-        time_ns=uuid_time_ns,
-        clock=uuid.clock_seq
+        time_ns=fields.timestamp_ns,
+        clock=fields.clock_seq
     )
     
 V2_OUTPUT = OUTPUT_BASE + """
@@ -80,14 +128,9 @@ Note: Variant uses only 2 bits, the 2 least significant bits of the variant are
 
 # https://laconsole.dev/blog/comprendre-uuid/
 # https://playfulprogramming.com/posts/what-happened-to-uuid-v2#problems-with-uuidv2
-def v2(uuid: UUID):
-        
-    local_id = uuid.int >> 96
-    timestamp_ns = get_timestamp(uuid)
-        
-    clock_sequence = (uuid.int >> 56) & 0x3f
+def v2(fields: UUIDFields):
     
-    local_domain = (uuid.int >> 48) & 0xff
+    local_domain = fields.local_domain
     if local_domain == 0:
         local_domain = f"{local_domain} (POSIX UID)"
     elif local_domain == 1:
@@ -97,7 +140,7 @@ def v2(uuid: UUID):
     else:
         local_domain = f"{local_domain} (Unknown)"
     
-    s = str(uuid)
+    s = str(fields.uuid)
     formatted_uuid = (
         f"{BRIGHT_CYAN}{s[:8]}{RESET}-"
         f"{GREEN}{s[9:13]}{RESET}-"
@@ -105,17 +148,17 @@ def v2(uuid: UUID):
         f"{YELLOW}{s[19]}{MAGENTA}{s[20]}{RESET}{CYAN}{s[21:23]}{RESET}-"
         f"{BLUE}{s[24:]}{RESET}"
     )
-    formatted_time = strftime(timestamp_ns)
+    formatted_time = strftime(fields.timestamp_ns)
     
     return V2_OUTPUT.format(
         **ALL_COLORS,
-        **get_common_info(uuid),
+        **get_common_info(fields),
         formatted_uuid=formatted_uuid,
         time=formatted_time,
-        time_ns=timestamp_ns,
-        local_id=local_id,
+        time_ns=fields.timestamp_ns,
+        local_id=fields.local_id,
         local_domain=local_domain,
-        clock=clock_sequence
+        clock=fields.clock_seq
     )
     
 V3_V5_OUTPUT = OUTPUT_BASE + """
@@ -124,8 +167,9 @@ V3_V5_OUTPUT = OUTPUT_BASE + """
 Note: Variant uses only 2 bits, the 2 least significant bits of the variant are part of the hash"""
 
 
-def v3(uuid: UUID):
+def v3(fields: UUIDFields):
     
+    uuid = fields.uuid
     s = str(uuid)
     formatted_uuid = (
         f"{GREEN}{s[:8]}{RESET}-"
@@ -141,7 +185,7 @@ def v3(uuid: UUID):
         
     return V3_V5_OUTPUT.format(
         **ALL_COLORS,
-        **get_common_info(uuid),
+        **get_common_info(fields),
         formatted_uuid=formatted_uuid,
         hash_type="MD5",
         hash=uuid_hash
@@ -150,9 +194,9 @@ def v3(uuid: UUID):
 V4_OUTPUT = OUTPUT_BASE + """
 Random bits: 122{RESET}"""
 
-def v4(uuid: UUID):
+def v4(fields: UUIDFields):
     
-    s = str(uuid)
+    s = str(fields.uuid)
     formatted_uuid = (
         f"{s[:8]}-"
         f"{s[9:13]}-"
@@ -163,12 +207,13 @@ def v4(uuid: UUID):
     
     return V4_OUTPUT.format(
         **ALL_COLORS,
-        **get_common_info(uuid),
+        **get_common_info(fields),
         formatted_uuid=formatted_uuid
     )
 
-def v5(uuid: UUID):
+def v5(fields: UUIDFields):
     
+    uuid = fields.uuid
     s = str(uuid)
     formatted_uuid = (
         f"{GREEN}{s[:8]}{RESET}-"
@@ -183,16 +228,16 @@ def v5(uuid: UUID):
         
     return V3_V5_OUTPUT.format(
         **ALL_COLORS,
-        **get_common_info(uuid),
+        **get_common_info(fields),
         formatted_uuid=formatted_uuid,
         hash_type="SHA1",
         hash=uuid_hash,
     )
 
 
-def v6(uuid: UUID):
+def v6(fields: UUIDFields):
     
-    s = str(uuid)
+    s = str(fields.uuid)
     formatted_uuid = (
         f"{GREEN}{s[:8]}{RESET}-"
         f"{GREEN}{s[9:13]}{RESET}-"
@@ -201,18 +246,15 @@ def v6(uuid: UUID):
         f"{BLUE}{s[24:]}{RESET}"
     )
     
-    # https://github.com/stevesimmons/pyuuid6/blob/main/uuid6.py
-    time_val = ((uuid.int >> 80) << 12) + ((uuid.int >> 64) & 4095)
-    timestamp_ns = time_val * 100 - GREGORIAN_UNIX_OFFSET
-    formatted_time = strftime(timestamp_ns)
+    formatted_time = strftime(fields.timestamp_ns)
     
     return V1_V6_OUTPUT.format(
         **ALL_COLORS,
-        **get_common_info(uuid),
+        **get_common_info(fields),
         formatted_uuid=formatted_uuid,
         time=formatted_time,
-        time_ns=timestamp_ns,
-        clock=uuid.clock_seq
+        time_ns=fields.timestamp_ns,
+        clock=fields.clock_seq
     )
 
 V7_OUTPUT = OUTPUT_BASE + """
@@ -221,13 +263,11 @@ Random bits: 74{RESET}
 """
 
 
-def v7(uuid: UUID):
+def v7(fields: UUIDFields):
     
-    timestamp_ms = uuid.int >> 80
-    timestamp_ns = timestamp_ms * 1_000_000
-    formatted_time = strftime(timestamp_ns)
+    formatted_time = strftime(fields.timestamp_ns)
     
-    s = str(uuid)
+    s = str(fields.uuid)
     
     formatted_uuid = (
         f"{GREEN}{s[:8]}{RESET}-"
@@ -239,10 +279,10 @@ def v7(uuid: UUID):
     
     return V7_OUTPUT.format(
         **ALL_COLORS,
-        **get_common_info(uuid),
+        **get_common_info(fields),
         formatted_uuid=formatted_uuid,
         time=formatted_time,
-        time_ns=timestamp_ns
+        time_ns=fields.timestamp_ns
     )
     
     
@@ -253,11 +293,9 @@ V8_OUTPUT = OUTPUT_BASE + """
 
 Possible timestamp: {possible_timestamp}"""
 
-def v8(uuid: UUID):
+def v8(fields: UUIDFields):
     
-    custom_a = uuid.int >> 80
-    custom_b = (uuid.int >> 64) & 0x0fff
-    custom_c = uuid.int & ((1 << 62) - 1)
+    uuid = fields.uuid
     
     # It was originally planned that UUIDv8s would have a timestamp as specified here:
     # https://datatracker.ietf.org/doc/draft-peabody-dispatch-new-uuid-format/02/   4.5.  UUIDv8 Layout and Bit Order
@@ -285,11 +323,11 @@ def v8(uuid: UUID):
     
     return V8_OUTPUT.format(
         **ALL_COLORS,
-        **get_common_info(uuid),
+        **get_common_info(fields),
         formatted_uuid=formatted_uuid,
-        custom_a=custom_a,
-        custom_b=custom_b,
-        custom_c=custom_c,
+        custom_a=fields.custom_a,
+        custom_b=fields.custom_b,
+        custom_c=fields.custom_c,
         possible_timestamp=formatted_possible_timestamp
     )
     
@@ -301,9 +339,9 @@ UUID: {formatted_uuid}
 
 No additional information is available for this UUID"""
 
-def other(uuid: UUID):
+def other(fields: UUIDFields):
     
-    s = str(uuid)
+    s = str(fields.uuid)
     formatted_uuid = (
         f"{s[:8]}-"
         f"{s[9:13]}-"
@@ -314,7 +352,7 @@ def other(uuid: UUID):
     
     return OTHER_OUTPUT.format(
         **ALL_COLORS,
-        **get_common_info(uuid),
+        **get_common_info(fields),
         formatted_uuid=formatted_uuid
     )
 
@@ -331,13 +369,16 @@ VERSIONS = {
     8: "Custom"
 }
 
-def get_common_info(uuid: UUID) -> dict:
+def format_node(node: int) -> str:
+    return ":".join(f"{b:02x}" for b in node.to_bytes(6, "big"))
+
+def get_common_info(fields: UUIDFields) -> dict:
     
-    version = get_version(uuid)
+    version = fields.version
     version = f"{version} ({VERSIONS.get(version, 'Unknown')})"
     
     # https://datatracker.ietf.org/doc/html/rfc9562#name-variant-field
-    variant = get_variant(uuid)
+    variant = fields.variant
     
     if variant < 0x8:    variant = f"{variant:x} (NCS)"
     elif variant < 0xc: variant = f"{variant:x} (RFC 9562)"
@@ -347,14 +388,69 @@ def get_common_info(uuid: UUID) -> dict:
     return {
         "version": version,
         "variant": variant,
-        "node": ":".join(f"{b:02x}" for b in uuid.node.to_bytes(6, "big")),
+        "node": format_node(fields.uuid.node),
     }
-    
 
 
+RECORD_FIELDS = UUIDFields._fields
 
+def info_record(uuid: "str | UUID") -> dict:
+    """Get information about a UUID as a flat record, without any formatting.
+    Fields that don't apply to the version of the UUID are None
 
+    :param uuid: The UUID to get information about
+    """
+    
+    record = decode(uuid)._asdict()
+    record["uuid"] = str(record["uuid"])
+    
+    if record["node"] is not None:
+        record["node"] = format_node(record["node"])
+    
+    for field in ("custom_a", "custom_b", "custom_c"):
+        if record[field] is not None:
+            record[field] = f"{record[field]:x}"
+    
+    return record
 
 
+def iter_info_records(lines: Iterable[str]) -> Iterator[dict]:
+    """Lazily get information about one UUID per line. Empty lines are ignored and invalid
+    UUIDs are reported on stderr then skipped
+
+    :param lines: The lines to read the UUIDs from, like a file or sys.stdin
+    """
+    
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield info_record(line)
+        except UUIDToolError as e:
+            print(f"Line {line_number}:", *e.args, file=sys.stderr)
 
 
+def write_info_records(records: Iterable[dict], fmt: Literal["jsonl", "csv", "tsv"] = "jsonl",
+                       file: TextIO = None, chunk_size: int = 4096):
+    """Write records from info_record as JSON Lines, CSV or TSV
+    
+    :param records: The records to write
+    :param fmt: The output format
+    :param file: The file to write to, defaults to stdout
+    :param chunk_size: The number of records written at once
+    """
+    
+    file = file or sys.stdout
+    records = iter(records)
+    
+    if fmt == "jsonl":
+        while chunk := list(islice(records, chunk_size)):
+            file.write("".join(json.dumps(record, separators=(",", ":")) + "\n" for record in chunk))
+    elif fmt in ("csv", "tsv"):
+        writer = csv.DictWriter(file, RECORD_FIELDS, delimiter="," if fmt == "csv" else "\t", lineterminator="\n")
+        writer.writeheader()
+        while chunk := list(islice(records, chunk_size)):
+            writer.writerows(chunk)
+    else:
+        raise UUIDToolError(f"Unknown output format: {fmt}")
@@ -0,0 +1,83 @@
+import heapq
+from typing import Iterable, Iterator
+
+from uuidtool.commands.edit import TIME_FIELDS
+from uuidtool.utils import *
+
+
+def iter_nearest(anchors: "Iterable[str | UUID]", budget: int) -> Iterator[UUID]:
+    """Lazily generate the UUIDs closest in time to any of several anchor UUIDs, closest first.
+
+    Each timestamp belongs to its nearest anchor, so where the windows of anchors sharing
+    the same non-time fields overlap, no UUID is generated twice. For a single anchor and an
+    odd budget, the order is the same as range with the alt sort mode. With an even count,
+    range has no middle UUID, so it doesn't start from the anchor like this does.
+
+    :param anchors: The anchor UUIDs, they must all have the same version
+    :param budget: The maximum number of UUIDs to generate
+    """
+
+    anchors = [get_uuid(anchor) for anchor in anchors]
+    if not anchors:
+        raise UUIDToolError("At least one anchor UUID is required")
+
+    if isinstance(budget, float):
+        budget = int(budget)
+    if not isinstance(budget, int) or budget < 1:
+        raise UUIDToolError(f"Invalid budget: Expected a positive integer, got {budget}")
+
+    version = get_version(anchors[0])
+    for anchor in anchors:
+        if get_version(anchor) != version:
+            raise UUIDToolError(f"All anchors must have the same version ({version} and {get_version(anchor)})")
+
+    bounds = get_time_bounds(version)
+    if bounds is None:
+        raise UUIDToolError(f"UUID version {version} has no timestamp, so it has no nearest UUIDs")
+    clock_tick, lowest, highest = bounds
+
+    # Anchors sharing the same non-time fields generate the same UUIDs for a given timestamp
+    time_mask, time_bits = TIME_FIELDS[version]
+    groups = {}
+    for anchor in anchors:
+        groups.setdefault(anchor.int & time_mask, set()).add(get_timestamp(anchor))
+
+    # Heap entries: (distance in ticks, direction (0 = down, 1 = up), anchor order, timestamp, last timestamp, non-time bits)
+    heap = []
+    order = 0
+    for base, group in groups.items():
+        timestamps = sorted(group)
+        for i, t in enumerate(timestamps):
+            # Ties between 2 anchors go to the earliest one
+            if i > 0:
+                previous = timestamps[i - 1]
+                low = previous + ((t - previous) // clock_tick // 2 + 1) * clock_tick
+            else:
+                low = t - (t - lowest) // clock_tick * clock_tick
+            if i < len(timestamps) - 1:
+                high = t + ((timestamps[i + 1] - t) // clock_tick // 2) * clock_tick
+            else:
+                high = t + (highest - 1 - t) // clock_tick * clock_tick
+
+            heap.append((0, 0, order, t, t, base))
+            if t - clock_tick >= low:
+                heap.append((1, 0, order, t - clock_tick, low, base))
+            if t + clock_tick <= high:
+                heap.append((1, 1, order, t + clock_tick, high, base))
+            order += 1
+    heapq.heapify(heap)
+
+    def generate():
+        for _ in range(budget):
+            if not heap:
+                return
+            distance, direction, anchor_order, t, last, base = heap[0]
+            yield UUID(int=base | time_bits(t))
+
+            next_t = t + clock_tick if direction else t - clock_tick
+            if t != last and (next_t <= last if direction else next_t >= last):
+                heapq.heapreplace(heap, (distance + 1, direction, anchor_order, next_t, last, base))
+            else:
+                heapq.heappop(heap)
+
+    return generate()
@@ -0,0 +1,227 @@
+import asyncio, ssl, time
+from typing import Iterable, NamedTuple
+from urllib.parse import urlsplit
+
+from uuidtool.utils import *
+
+PLACEHOLDER = "{uuid}"
+
+
+class ProbeResult(NamedTuple):
+    """Result of a probe run"""
+    hits: "list[tuple[str, int]]"
+    requests: int
+    seconds: float
+
+    @property
+    def per_second(self) -> float:
+        return self.requests / self.seconds if self.seconds > 0 else 0.0
+
+
+def probe(candidates: Iterable[str], url: str, method: str = "GET", data: str = None, headers: "dict[str, str]" = None,
+          concurrency: int = 16, match_status: "list[int]" = None, match_text: str = None, max_hits: int = 1,
+          timeout: float = 10.0, on_hit=None) -> ProbeResult:
+    """Send a request for each candidate and report the ones matching a hit condition.
+    Requests are sent over a bounded pool of keep-alive connections
+
+    :param candidates: The candidates, like UUIDs from sandwich or range
+    :param url: The URL to request, {uuid} is replaced by each candidate. Only the path and query can contain {uuid}
+    :param method: The HTTP method
+    :param data: The request body, {uuid} is replaced by each candidate
+    :param headers: Additional request headers
+    :param concurrency: Number of connections
+    :param match_status: Status codes of a hit, any 2xx status by default
+    :param match_text: Text that the response body of a hit must contain
+    :param max_hits: Stop after this number of hits, 0 to try every candidate
+    :param timeout: Timeout of each request in seconds
+    :param on_hit: Function called with (candidate, status) for each hit
+    """
+
+    return asyncio.run(probe_async(candidates, url, method, data, headers, concurrency, match_status,
+                                   match_text, max_hits, timeout, on_hit))
+
+
+async def probe_async(candidates: Iterable[str], url: str, method: str = "GET", data: str = None,
+                      headers: "dict[str, str]" = None, concurrency: int = 16, match_status: "list[int]" = None,
+                      match_text: str = None, max_hits: int = 1, timeout: float = 10.0, on_hit=None) -> ProbeResult:
+    """Asynchronous version of probe"""
+
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise UUIDToolError(f"Invalid URL: {url}, it must start with http:// or https://")
+    if PLACEHOLDER in parts.netloc:
+        raise UUIDToolError(f"{PLACEHOLDER} can't be in the host of the URL")
+    if concurrency < 1:
+        raise UUIDToolError(f"Concurrency must be at least 1, got {concurrency}")
+
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    ssl_context = ssl.create_default_context() if parts.scheme == "https" else None
+
+    base_headers = {"Host": parts.netloc, "User-Agent": "uuidtool", "Accept": "*/*"}
+    base_headers.update(headers or {})
+
+    match_text = match_text.encode() if match_text is not None else None
+    hits = []
+    requests = 0
+    done = asyncio.Event()
+    queue = asyncio.Queue(maxsize=2 * concurrency)
+
+    def is_hit(status: int, body: bytes) -> bool:
+        if match_status is None and not 200 <= status < 300:
+            return False
+        if match_status is not None and status not in match_status:
+            return False
+        return match_text is None or match_text in body
+
+    async def worker():
+        nonlocal requests
+        connection = _Connection(parts.hostname, port, ssl_context, timeout)
+        try:
+            # Checking done before waiting for a candidate also stops a worker whose cancellation was lost
+            # by wait_for, when its request completed at the same time
+            while not done.is_set() and (candidate := await queue.get()) is not None:
+                body = data.replace(PLACEHOLDER, candidate).encode() if data is not None else None
+                status, response = await connection.request(method, target.replace(PLACEHOLDER, candidate),
+                                                            base_headers, body)
+                requests += 1
+                # Requests still in flight when the hit limit is reached don't count
+                if is_hit(status, response) and not done.is_set():
+                    hits.append((candidate, status))
+                    if on_hit is not None:
+                        on_hit(candidate, status)
+                    if max_hits and len(hits) >= max_hits:
+                        done.set()
+        except BaseException:
+            done.set()
+            raise
+        finally:
+            await connection.close()
+
+    async def put(item) -> bool:
+        # Wait for room in the queue, unless the probe stops in the meantime (every worker may have failed)
+        try:
+            queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            pass
+        putter = asyncio.ensure_future(queue.put(item))
+        stopper = asyncio.ensure_future(done.wait())
+        await asyncio.wait({putter, stopper}, return_when=asyncio.FIRST_COMPLETED)
+        stopper.cancel()
+        if not putter.done():
+            putter.cancel()
+            return False
+        return True
+
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(worker()) for _ in range(concurrency)]
+
+    try:
+        for candidate in candidates:
+            candidate = candidate.strip()
+            if done.is_set() or candidate and not await put(candidate):
+                break
+        for _ in tasks:
+            if done.is_set() or not await put(None):
+                break
+    except BaseException:
+        done.set()
+        raise
+    finally:
+        # After a hit limit or a failure, what is left in the queue is never probed
+        if done.is_set():
+            for task in tasks:
+                task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+    return ProbeResult(hits, requests, time.perf_counter() - start)
+
+
+class _Connection:
+    """Minimal HTTP/1.1 client connection, kept alive between requests"""
+
+    def __init__(self, host: str, port: int, ssl_context: "ssl.SSLContext | None", timeout: float):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method: str, target: str, headers: "dict[str, str]", body: "bytes | None") -> "tuple[int, bytes]":
+
+        head = f"{method} {target} HTTP/1.1\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        if body is not None:
+            head += f"Content-Length: {len(body)}\r\n"
+        message = (head + "\r\n").encode() + (body or b"")
+
+        # A kept alive connection may have been closed by the server in the meantime, so retry once
+        for attempt in range(2):
+            reused = self.writer is not None
+            try:
+                return await asyncio.wait_for(self._send(method, message), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                await self.close()
+                if not reused or attempt == 1:
+                    raise UUIDToolError(f"Connection to {self.host}:{self.port} failed: {e}")
+            except asyncio.TimeoutError:
+                await self.close()
+                raise UUIDToolError(f"Request to {self.host}:{self.port} timed out after {self.timeout} seconds")
+            except OSError as e:
+                await self.close()
+                raise UUIDToolError(f"Connection to {self.host}:{self.port} failed: {e.strerror or e}")
+
+    async def close(self):
+
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+        self.reader = self.writer = None
+
+    async def _send(self, method: str, message: bytes) -> "tuple[int, bytes]":
+
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl_context)
+
+        self.writer.write(message)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by the server")
+        status = int(status_line.split()[1])
+
+        response_headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        keep_alive = response_headers.get("connection", "").lower() != "close"
+
+        if method == "HEAD" or 100 <= status < 200 or status in (204, 304):
+            body = b""
+        elif response_headers.get("transfer-encoding", "").lower() == "chunked":
+            body = b""
+            while (size := int((await self.reader.readline()).split(b";")[0], 16)) > 0:
+                body += (await self.reader.readexactly(size + 2))[:-2]
+            while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+        elif "content-length" in response_headers:
+            body = await self.reader.readexactly(int(response_headers["content-length"]))
+        else:
+            body = await self.reader.read()
+            keep_alive = False
+
+        if not keep_alive:
+            await self.close()
+
+        return status, body
@@ -1,7 +1,10 @@
-from typing import Literal
-from uuidtool.commands.edit import set_time
+from typing import TYPE_CHECKING, Iterator, Literal
+from uuidtool.commands.edit import iter_times
 from uuidtool.utils import *
 
+if TYPE_CHECKING:
+    from uuidtool.commands.analyze import ClockProfile
+
 
 
 def uuid_range(uuid: "str | UUID", count: int, sort: Literal["asc", "desc", "alt"] = "alt"):
@@ -12,7 +15,37 @@ def uuid_range(uuid: "str | UUID", count: int, sort: Literal["asc", "desc", "alt
     :param sort: Way to sort the resulting UUIDs
     """
     
+    return list(iter_range(uuid, count, sort))
+
+
+def iter_range(uuid: "str | UUID", count: int, sort: Literal["asc", "desc", "alt"] = "alt", model=None,
+               profile: "ClockProfile | None" = None) -> Iterator[UUID]:
+    """Lazily generate a range of UUIDs around the timestamp of a given UUID.
+    UUIDs are produced one at a time, so memory usage does not depend on count
+
+    :param uuid: The UUID to generate a range from. Will be in the middle of the range
+    :param count: The number of UUIDs to generate
+    :param sort: Way to sort the resulting UUIDs
+    :param model: A model ordering the UUIDs from the most to the least likely, like model.TimingModel.
+    The sort mode is then only used between equally likely UUIDs
+    :param profile: Clock profile of the generator (see analyze), only timestamps it can produce are generated
+    """
+    
     uuid = get_uuid(uuid)
+    timestamps = range_timestamps(uuid, count, profile)
+    it = iter_sorted(timestamps, sort) if model is None else model.order(timestamps, sort)
+    
+    return iter_times(uuid, it)
+
+
+def range_timestamps(uuid: UUID, count: int, profile: "ClockProfile | None" = None) -> range:
+    """Get the timestamps of a range of UUIDs around the timestamp of a given UUID
+
+    :param uuid: The UUID to generate a range from. Will be in the middle of the range
+    :param count: The number of UUIDs to generate
+    :param profile: Clock profile of the generator (see analyze), only timestamps it can produce are generated
+    """
+    
     if isinstance(count, float): count = int(count)
     
     if not isinstance(count, int):
@@ -23,34 +56,19 @@ def uuid_range(uuid: "str | UUID", count: int, sort: Literal["asc", "desc", "alt
     if count <= 1:
         raise UUIDToolError(f"Count must be greater than 1, got {count}")
     
-    if version in (1, 6):
-        clock_tick = 100
-        highest = 0x5966c59f06182ff9c
-        lowest = -GREGORIAN_UNIX_OFFSET
-    elif version == 2:
-        clock_tick = V2_CLOCK_TICK
-        highest = 0x5966c598621830000
-        lowest = -GREGORIAN_UNIX_OFFSET
-    elif version == 7:
-        clock_tick = 1_000_000
-        highest = (2**48 - 1) * 1_000_000
-        lowest = 0
-    else:
+    bounds = get_time_bounds(version)
+    if bounds is None:
         raise UUIDToolError(f"This version of UUID ({version}) has no timestamp, so it can't be ranged")
+    clock_tick, lowest, highest = bounds
     
     t = get_timestamp(uuid)
     
+    if profile is not None:
+        profile.check(version)
+        clock_tick = profile.tick_ns
+        t = profile.align(t)
+        lowest = profile.align(lowest)
+    
     low = max(lowest, t - clock_tick * (count // 2))
     high = min(highest, t + clock_tick * (count // 2 + count % 2))
-    timestamps = range(low, high, clock_tick)
-    
-    if sort == "asc":
-        it = timestamps
-    elif sort == "desc":
-        it = reversed(timestamps)
-    elif sort == "alt":
-        it = alt_sort(timestamps)
-    else:
-        raise UUIDToolError(f"Unknown sort mode: {sort}")
-
-    return [set_time(uuid, timestamp) for timestamp in it]
\ No newline at end of file
+    return range(low, high, clock_tick)
@@ -1,7 +1,10 @@
-from typing import Literal
-from uuidtool.commands.edit import set_time
+from typing import TYPE_CHECKING, Iterator, Literal
+from uuidtool.commands.edit import iter_times
 from uuidtool.utils import *
 
+if TYPE_CHECKING:
+    from uuidtool.commands.analyze import ClockProfile
+
 
 def sandwich(uuid1: "str | UUID", uuid2: "str | UUID", sort: Literal["asc", "desc", "alt"] = "alt"):
     """Perform a sandwich attack
@@ -10,8 +13,38 @@ def sandwich(uuid1: "str | UUID", uuid2: "str | UUID", sort: Literal["asc", "des
         :param uuid2: The second UUID
         :param sort: Way to sort the resulting UUIDs
     """
+    
+    return list(iter_sandwich(uuid1, uuid2, sort))
+
+
+def iter_sandwich(uuid1: "str | UUID", uuid2: "str | UUID", sort: Literal["asc", "desc", "alt"] = "alt",
+                  model=None, profile: "ClockProfile | None" = None) -> Iterator[UUID]:
+    """Lazily perform a sandwich attack.
+    UUIDs are produced one at a time, so memory usage does not depend on the gap between the 2 UUIDs
+
+        :param uuid1: The first UUID
+        :param uuid2: The second UUID
+        :param sort: Way to sort the resulting UUIDs
+        :param model: A model ordering the UUIDs from the most to the least likely, like model.TimingModel.
+        The sort mode is then only used between equally likely UUIDs
+        :param profile: Clock profile of the generator (see analyze), only timestamps it can produce are generated
+    """
+    
     uuid1 = get_uuid(uuid1)
     uuid2 = get_uuid(uuid2)
+    timestamps = sandwich_timestamps(uuid1, uuid2, profile)
+    it = iter_sorted(timestamps, sort) if model is None else model.order(timestamps, sort)
+    
+    return iter_times(uuid1, it)
+
+
+def sandwich_timestamps(uuid1: UUID, uuid2: UUID, profile: "ClockProfile | None" = None) -> range:
+    """Get the timestamps strictly between those of 2 UUIDs
+
+        :param uuid1: The first UUID
+        :param uuid2: The second UUID
+        :param profile: Clock profile of the generator (see analyze), only timestamps it can produce are generated
+    """
     
     version = get_version(uuid1)
     version2 = get_version(uuid2)
@@ -28,35 +61,20 @@ def sandwich(uuid1: "str | UUID", uuid2: "str | UUID", sort: Literal["asc", "des
     if t1 > t2:
         t1, t2 = t2, t1
     
-    if version in (1, 6):
-        clock_tick = 100
-        highest = 0x5966c59f06182ff9c
-        lowest = -GREGORIAN_UNIX_OFFSET
-    elif version == 2:
-        clock_tick = V2_CLOCK_TICK
-        highest = 0x5966c598621830000
-        lowest = -GREGORIAN_UNIX_OFFSET
-    elif version == 7:
-        clock_tick = 1_000_000
-        highest = (2**48 - 1) * 1_000_000
-        lowest = 0
-    else:
+    bounds = get_time_bounds(version)
+    if bounds is None:
         raise UUIDToolError(f"UUID version {version} has no timestamp, so it can't be sandwiched")
+    clock_tick, lowest, highest = bounds
     
     low = max(lowest, t1 + clock_tick)
     high = min(highest, t2)
-    timestamps = range(low, high, clock_tick)
-    
-    if sort == "asc":
-        it = timestamps
-    elif sort == "desc":
-        it = reversed(timestamps)
-    elif sort == "alt":
-        it = alt_sort(timestamps)
-    else:
-        raise UUIDToolError(f"Unknown sort mode: {sort}")
-
-    return [set_time(uuid1, timestamp) for timestamp in it]
+    
+    if profile is not None:
+        profile.check(version)
+        clock_tick = profile.tick_ns
+        low = profile.align(low)
+    
+    return range(low, high, clock_tick)
 
 
     
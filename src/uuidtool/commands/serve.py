@@ -0,0 +1,187 @@
+import io, json, os, shlex, socket, socketserver, sys, threading
+from contextlib import redirect_stderr, redirect_stdout
+from typing import BinaryIO
+
+from uuidtool.client import SOCKET_ENV
+from uuidtool.utils import *
+
+# Commands redirect the standard streams of the whole process, so they run one at a time
+_lock = threading.Lock()
+
+# Output of a command is sent by frames of at least this size, unless it is flushed
+FRAME_SIZE = 1 << 16
+
+
+def serve(socket_path: str = None):
+    """Answer uuidtool commands from a warm process, so that they don't pay for the interpreter startup and imports.
+
+    Each request is a line, either a command line (like `info <uuid>`) or a JSON object like
+    {"argv": ["info", "<uuid>"], "cwd": "/path"}. The output of the command is streamed while it runs,
+    as frames made of a header line `<1 for stdout or 2 for stderr> <size>` followed by size bytes,
+    then the response ends with a line `exit <exit code>`. Commands get an empty stdin
+
+    :param socket_path: Unix socket to listen on, stdio by default
+    """
+
+    if socket_path is None:
+        _serve_stdio()
+    else:
+        _serve_unix(socket_path)
+
+
+def handle_request(line: bytes, out: BinaryIO):
+    """Run a request and stream its response, see serve
+
+    :param line: The request
+    :param out: The file to write the response to
+    """
+
+    try:
+        text = line.decode()
+        if text.lstrip().startswith("{"):
+            request = json.loads(text)
+            argv, cwd = request["argv"], request.get("cwd")
+            if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+                raise ValueError("argv must be a list of strings")
+        else:
+            argv, cwd = shlex.split(text), None
+    except (ValueError, KeyError, TypeError) as e:
+        _FrameWriter(out, 2).write(f"Invalid request: {e}\n".encode())
+        code = 2
+    else:
+        code = execute(argv, cwd, out)
+
+    out.write(f"exit {code}\n".encode())
+    out.flush()
+
+
+def execute(argv: "list[str]", cwd: str = None, out: BinaryIO = None) -> int:
+    """Run a uuidtool command in this process and stream its output as frames, see serve
+
+    :param argv: The arguments of the command, like sys.argv[1:]
+    :param cwd: The directory to run the command from, defaults to the current one
+    :param out: The file to write the frames to
+    :return: The exit code of the command
+    """
+
+    from uuidtool.cli import run
+
+    if argv[:1] == ["serve"]:
+        _FrameWriter(out, 2).write(b"serve can't be run from uuidtool serve\n")
+        return 1
+
+    stdout = _frame_stream(out, 1)
+    stderr = _frame_stream(out, 2)
+    code = 0
+
+    with _lock:
+        stdin, previous_cwd = sys.stdin, os.getcwd()
+        sys.stdin = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        try:
+            if cwd is not None:
+                os.chdir(cwd)
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                try:
+                    run(argv)
+                except SystemExit as e:
+                    code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except OSError as e:
+            code = 1
+            stderr.write(f"Cannot change directory to {cwd}: {e.strerror}\n")
+        finally:
+            sys.stdin = stdin
+            os.chdir(previous_cwd)
+            for stream in (stdout, stderr):
+                try:
+                    stream.flush()
+                except BrokenPipeError:
+                    pass
+
+    return code
+
+
+class _FrameWriter(io.RawIOBase):
+    """Send what is written to it as frames of one stream of a response"""
+
+    def __init__(self, out: BinaryIO, stream: int):
+
+        self.out = out
+        self.stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+
+        if not data:
+            return 0
+        try:
+            self.out.write(f"{self.stream} {len(data)}\n".encode() + bytes(data))
+            self.out.flush()
+        except OSError as e:
+            # The client went away, commands stop like when the reader of stdout exits
+            raise BrokenPipeError(*e.args) from e
+        return len(data)
+
+
+def _frame_stream(out: BinaryIO, stream: int) -> io.TextIOWrapper:
+
+    # Small writes are gathered by the buffer, large ones (like the chunks of range) are sent as they come
+    return io.TextIOWrapper(io.BufferedWriter(_FrameWriter(out, stream), FRAME_SIZE), encoding="utf-8",
+                            write_through=True)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+
+        for line in self.rfile:
+            if line.strip():
+                try:
+                    handle_request(line, self.wfile)
+                except OSError:
+                    break  # The client went away
+
+
+def _serve_stdio():
+
+    out = sys.stdout.buffer
+    for line in sys.stdin.buffer:
+        if line.strip():
+            handle_request(line, out)
+
+
+def _serve_unix(socket_path: str):
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise UUIDToolError("Unix sockets are not supported on this platform, serve over stdio instead")
+
+    if os.path.exists(socket_path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(socket_path)
+            except OSError:
+                os.unlink(socket_path)  # Left over by a server that didn't stop cleanly
+            else:
+                raise UUIDToolError(f"A server is already listening on {socket_path}")
+
+    # Commands can read and write files, so only the owner can connect
+    umask = os.umask(0o177)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(socket_path, _Handler)
+    except OSError as e:
+        raise UUIDToolError(f"Cannot listen on {socket_path}: {e.strerror or e}")
+    finally:
+        os.umask(umask)
+
+    server.daemon_threads = True
+    print(f"Listening on {socket_path}, set {SOCKET_ENV}={socket_path} to use it", file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
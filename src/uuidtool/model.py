@@ -0,0 +1,129 @@
+import heapq, math
+from collections import Counter
+from typing import Iterable, Iterator, Literal
+
+from uuidtool.utils import *
+
+DEFAULT_PERIOD_NS = 1_000_000
+
+
+class TimingModel:
+    """Estimate which timestamps a UUID generator is likely to produce, from a sample of its UUIDs.
+
+    Timestamps are split into buckets by their position within a period (1 ms by default), since
+    generators cluster their timestamps at clock boundaries (e.g. ms on Windows). Buckets are ranked
+    by their frequency in the sample, and buckets absent from it come last, so no candidate is ruled out.
+
+    Any object with an order(timestamps, sort) method can be used as a model by range and sandwich
+    """
+
+    def __init__(self, version: int, period_ns: int, counts: "dict[int, int]"):
+        """
+        :param version: The UUID version of the sample
+        :param period_ns: The period in nanoseconds, a multiple of the clock tick of the version
+        :param counts: Number of sampled timestamps per bucket
+        """
+
+        bounds = get_time_bounds(version)
+        if bounds is None:
+            raise UUIDToolError(f"UUID version {version} has no timestamp, so it can't be modeled")
+        self.clock_tick = bounds[0]
+
+        if not isinstance(period_ns, int) or period_ns <= 0 or period_ns % self.clock_tick != 0:
+            raise UUIDToolError(f"Period must be a positive multiple of {self.clock_tick} ns for UUID version {version}, got {period_ns}")
+
+        self.version = version
+        self.period_ns = period_ns
+        self.counts = dict(counts)
+        self.total = sum(self.counts.values())
+
+    @classmethod
+    def fit(cls, uuids: "Iterable[str | UUID]", period_ns: int = None, step_ns: int = None) -> "TimingModel":
+        """Fit a model from a sample of UUIDs produced by the same generator
+
+        :param uuids: The sampled UUIDs, they must all have the same version
+        :param period_ns: The period in nanoseconds, defaults to 1 ms (or the clock tick if it is longer)
+        :param step_ns: Step of the timestamps the model will order, like the tick of a clock profile.
+        The default period is then extended to a multiple of it
+        """
+
+        uuids = [get_uuid(uuid) for uuid in uuids]
+        if not uuids:
+            raise UUIDToolError("At least one UUID is required to fit a model")
+
+        version = get_version(uuids[0])
+        for uuid in uuids:
+            if get_version(uuid) != version:
+                raise UUIDToolError(f"All sampled UUIDs must have the same version ({version} and {get_version(uuid)})")
+
+        bounds = get_time_bounds(version)
+        if bounds is None:
+            raise UUIDToolError(f"UUID version {version} has no timestamp, so it can't be modeled")
+        if period_ns is None:
+            period_ns = max(DEFAULT_PERIOD_NS, bounds[0])
+            if step_ns is not None:
+                period_ns = math.lcm(period_ns, step_ns)
+
+        model = cls(version, period_ns, {})
+        model.counts = dict(Counter(model.bucket(get_timestamp(uuid)) for uuid in uuids))
+        model.total = len(uuids)
+        return model
+
+    def bucket(self, timestamp: int) -> int:
+        """Get the bucket of a timestamp
+
+        :param timestamp: The timestamp in nanoseconds
+        """
+
+        return (timestamp % self.period_ns) // self.clock_tick
+
+    def order(self, timestamps: range, sort: Literal["asc", "desc", "alt"] = "alt") -> Iterator[int]:
+        """Lazily iterate over timestamps from the most to the least likely.
+        Timestamps that are as likely as each other keep the order of the sort mode, so with an
+        empty sample, the order is the same as iter_sorted. Memory usage depends on the period, not
+        on the number of timestamps
+
+        :param timestamps: The timestamps in nanoseconds, in ascending order
+        :param sort: Way to sort equally likely timestamps
+        """
+
+        iter_sorted(timestamps, sort)  # Fail early on an invalid sort mode
+
+        step = timestamps.step
+        if step % self.clock_tick != 0 or self.period_ns % step != 0:
+            raise UUIDToolError(f"Timestamp step must be a multiple of {self.clock_tick} ns dividing the period of the model ({self.period_ns} ns), got {step}")
+
+        # Timestamps whose indexes are congruent modulo stride fall into the same bucket
+        size = len(timestamps)
+        stride = self.period_ns // step
+        levels = {}
+        for offset in range(min(stride, size)):
+            count = self.counts.get(self.bucket(timestamps[offset]), 0)
+            levels.setdefault(count, []).append(offset)
+
+        mid, odd = size // 2, size % 2
+
+        def alt_position(i: int) -> int:
+            return 2 * (mid - 1 - i) + odd if i < mid else 2 * (i - mid) + 1 - odd
+
+        def indexes(offsets: "list[int]") -> Iterator[int]:
+            # Each offset gives an arithmetic progression of indexes, merged back in the order of the sort mode
+            if sort == "asc":
+                return heapq.merge(*(range(offset, size, stride) for offset in offsets))
+            elif sort == "desc":
+                return heapq.merge(*(range(offset, size, stride)[::-1] for offset in offsets), reverse=True)
+
+            parts = []
+            for offset in offsets:
+                progression = range(offset, size, stride)
+                below = len(range(offset, mid, stride))
+                parts.append(progression[:below][::-1])
+                parts.append(progression[below:])
+            return heapq.merge(*parts, key=alt_position)
+
+        def generate():
+            for count in sorted(levels, reverse=True):
+                for i in indexes(levels[count]):
+                    yield timestamps[i]
+
+        return generate()
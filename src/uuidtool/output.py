@@ -0,0 +1,127 @@
+import os, sys
+from itertools import islice
+from typing import Iterable
+
+from uuidtool.utils import *
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+class Output:
+    """Buffered output of a command, to stdout or to a file. Writes are gathered in memory and
+    handed to the file by large chunks, so writing many lines costs a few system calls instead of
+    one per line. Use it as a context manager, what is left in the buffer is written on exit.
+
+    Strings are encoded as UTF-8, so an Output can also be given to writers expecting a text file
+    (like csv.writer). size counts every byte written, including the ones still in the buffer.
+    See handle_broken_pipe for readers of stdout that exit early
+    """
+
+    def __init__(self, path: str = None, buffer_size: int = DEFAULT_BUFFER_SIZE, append_at: int = None):
+        """
+        :param path: The file to write to, None or - for stdout
+        :param buffer_size: Number of bytes gathered before they are written
+        :param append_at: Size of the output written by a previous run, to resume it. The file is
+        truncated to this size and written after it, instead of being overwritten
+        """
+
+        self.path = None if path == "-" else path
+        self.buffer_size = buffer_size
+        self.append_at = append_at
+        self.file = None
+        self.size = append_at or 0
+        self._buffer = bytearray()
+
+    def __enter__(self) -> "Output":
+
+        if self.path is None:
+            sys.stdout.flush()  # Keep the order of what was printed before
+            self.file = sys.stdout.buffer
+        else:
+            try:
+                self.file = open(self.path, "wb" if self.append_at is None else "r+b")
+                if self.append_at is not None:
+                    self._truncate()
+            except OSError as e:
+                raise UUIDToolError(f"Cannot open {self.path}: {e.strerror}")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        try:
+            # After a broken pipe, writing again would only fail again
+            if not isinstance(exc_value, BrokenPipeError):
+                self.flush()
+        finally:
+            if self.path is not None:
+                self.file.close()
+
+    def write(self, data: "str | bytes | bytearray"):
+        """Write data, str are encoded as UTF-8
+
+        :param data: The data to write
+        """
+
+        if isinstance(data, str):
+            data = data.encode()
+        self.size += len(data)
+
+        if not self._buffer and len(data) >= self.buffer_size:
+            self.file.write(data)  # Large chunks are written as is, without copying them to the buffer
+            return
+
+        self._buffer += data
+        if len(self._buffer) >= self.buffer_size:
+            self.file.write(self._buffer)
+            self._buffer.clear()
+
+    def write_line(self, item):
+        """Write an item and a newline
+
+        :param item: The item to write, converted with str
+        """
+
+        self.write(f"{item}\n")
+
+    def write_lines(self, items: Iterable, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """Write items one per line, joining them by chunks
+
+        :param items: The items to write, converted with str
+        :param chunk_size: Number of items joined at once
+        """
+
+        items = iter(items)
+        while chunk := list(islice(items, chunk_size)):
+            self.write("\n".join(map(str, chunk)) + "\n")
+
+    def flush(self):
+        """Write the buffer and flush the file, for output that must show up right away"""
+
+        if self._buffer:
+            self.file.write(self._buffer)
+            self._buffer.clear()
+        self.file.flush()
+
+    def _truncate(self):
+
+        size = self.file.seek(0, os.SEEK_END)
+        if size < self.append_at:
+            self.file.close()
+            raise UUIDToolError(f"Cannot resume {self.path}: it has {size} bytes, less than the {self.append_at} already written")
+        self.file.truncate(self.append_at)
+        self.file.seek(self.append_at)
+
+
+def handle_broken_pipe():
+    """Exit after the reader of stdout went away (like `uuidtool range ... | head`). Stdout is
+    redirected to /dev/null first, so that flushing it when the interpreter exits fails silently
+    """
+
+    try:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    except (OSError, ValueError):
+        pass  # Not a real file, like the captured output of uuidtool serve
+    sys.exit(1)
@@ -0,0 +1,101 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Literal
+
+from uuidtool.batch import DEFAULT_CHUNK_SIZE, encode_packed, iter_packed, pack_timestamps
+from uuidtool.utils import *
+
+
+def parallel_packed(uuid: "str | UUID", timestamps: range, sort: Literal["asc", "desc", "alt"] = "alt",
+                    workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE, fmt: str = "raw",
+                    start: int = 0, stop: int = None) -> "Iterator[bytes | bytearray]":
+    """Build packed UUIDs with a pool of processes, see batch.pack_timestamps.
+    The sorted order is cut into chunks of contiguous positions that are built in parallel,
+    then yielded in order, so the output is exactly the same as with a single process
+
+    :param uuid: The template UUID
+    :param timestamps: The timestamps in nanoseconds, in ascending order
+    :param sort: Way to sort the resulting UUIDs
+    :param workers: Number of processes, defaults to the number of CPUs
+    :param chunk_size: Number of UUIDs built by a process at once
+    :param fmt: Format of the chunks (see batch.encode_packed), encoded by the workers. Defaults to packed UUIDs
+    :param start: Position in the sorted order of the first UUID to build
+    :param stop: Position in the sorted order after the last UUID to build, defaults to the end
+    """
+
+    uuid = get_uuid(uuid)
+    iter_sorted(timestamps, sort)  # Fail early on an invalid sort mode
+    encode_packed(b"", fmt)  # and format
+    workers = _check_workers(workers)
+
+    if chunk_size < 1:
+        raise UUIDToolError(f"Chunk size must be at least 1, got {chunk_size}")
+
+    end = len(timestamps) if stop is None else min(stop, len(timestamps))
+
+    def chunks():
+        with ProcessPoolExecutor(workers) as pool:
+            # Only a few chunks are in flight, so memory doesn't grow if the consumer is slower than the workers
+            pending = deque()
+            for position in range(max(start, 0), end, chunk_size):
+                pending.append(pool.submit(_pack_chunk, uuid, timestamps, sort, position, min(position + chunk_size, end), fmt))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    return chunks()
+
+
+def parallel_to_files(uuid: "str | UUID", timestamps: range, prefix: str, sort: Literal["asc", "desc", "alt"] = "alt",
+                      workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE, fmt: str = "text") -> "list[str]":
+    """Build UUIDs with a pool of processes, each one writing a contiguous shard of the sorted order
+    to its own file named <prefix>.<shard number>. Concatenating the files in order gives the full output
+
+    :param uuid: The template UUID
+    :param timestamps: The timestamps in nanoseconds, in ascending order
+    :param prefix: Prefix of the output files
+    :param sort: Way to sort the resulting UUIDs
+    :param workers: Number of processes (and files), defaults to the number of CPUs
+    :param chunk_size: Number of UUIDs built by a process at once
+    :param fmt: Format of the files, see batch.encode_packed
+    """
+
+    uuid = get_uuid(uuid)
+    iter_sorted(timestamps, sort)  # Fail early on an invalid sort mode
+    encode_packed(b"", fmt)  # and format
+    workers = _check_workers(workers)
+
+    paths = [f"{prefix}.{shard}" for shard in range(workers)]
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_write_shard, uuid, timestamps, sort, *shard_bounds(len(timestamps), shard, workers),
+                               path, chunk_size, fmt)
+                   for shard, path in enumerate(paths)]
+        for future in futures:
+            future.result()
+
+    return paths
+
+
+def _check_workers(workers: "int | None") -> int:
+
+    if workers is None:
+        return os.cpu_count() or 1
+    if not isinstance(workers, int) or workers < 1:
+        raise UUIDToolError(f"Number of workers must be at least 1, got {workers}")
+    return workers
+
+
+def _pack_chunk(uuid: UUID, timestamps: range, sort: str, start: int, stop: int, fmt: str) -> "bytes | bytearray":
+
+    return encode_packed(pack_timestamps(uuid, timestamps, sort, start, stop), fmt)
+
+
+def _write_shard(uuid: UUID, timestamps: range, sort: str, start: int, stop: int,
+                 path: str, chunk_size: int, fmt: str):
+
+    with open(path, "wb") as f:
+        for packed in iter_packed(uuid, timestamps, sort, chunk_size, start, stop):
+            f.write(encode_packed(packed, fmt))
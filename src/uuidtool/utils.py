@@ -1,4 +1,5 @@
-from datetime import datetime, timedelta
+import sys
+from typing import Iterable, Iterator, Literal, TextIO
 from uuid import UUID
 
 # https://uuid6.github.io/uuid6-ietf-draft/
@@ -45,8 +46,72 @@ def is_uuid(uuid_str: str) -> bool:
     if not isinstance(uuid_str, str):
         return False
     
-    uuid_str = uuid_str.replace("-", "")
-    return len(uuid_str) == 32 and all(c in "0123456789abcdef" for c in uuid_str.lower())
+    try:
+        parse_uuid(uuid_str)
+    except UUIDToolError:
+        return False
+    return True
+
+def parse_uuid(uuid_str: str) -> int:
+    """Validate and convert a UUID string to an integer in a single pass.
+    Canonical, without dashes, braced ({...}) and urn:uuid: forms are supported
+
+    Args:
+        uuid_str (str): The string to parse
+
+    Returns:
+        int: The UUID as a 128 bits integer
+    """
+    
+    if not isinstance(uuid_str, str):
+        raise UUIDToolError(f"{uuid_str!r} is not a valid UUID, expected a string")
+    
+    hex_str = uuid_str
+    if hex_str[:9].lower() == "urn:uuid:":
+        hex_str = hex_str[9:]
+    elif hex_str[:1] == "{" and hex_str[-1:] == "}":
+        hex_str = hex_str[1:-1]
+    
+    hex_str = hex_str.replace("-", "")
+    
+    # bytes.fromhex ignores whitespaces, a valid UUID is exactly 32 digits which give 16 bytes
+    try:
+        uuid_bytes = bytes.fromhex(hex_str) if len(hex_str) == 32 else b""
+    except ValueError:
+        uuid_bytes = b""
+    
+    if len(uuid_bytes) != 16:
+        raise UUIDToolError(f"{uuid_str} is not a valid UUID")
+    
+    return int.from_bytes(uuid_bytes, "big")
+
+def parse_many(uuid_strs: Iterable[str], packed: bool = False,
+               errors: Literal["raise", "skip"] = "raise") -> "list[int] | bytes":
+    """Parse many UUID strings, see parse_uuid. Surrounding whitespace is ignored, so lines read from a file can be parsed as is
+
+    Args:
+        uuid_strs (Iterable[str]): The strings to parse
+        packed (bool, optional): Return the UUIDs as packed 16 bytes records instead of integers. Defaults to False.
+        errors (str, optional): What to do with invalid UUIDs, raise an error or skip them. Defaults to raise.
+
+    Returns:
+        list[int] | bytes: The parsed UUIDs
+    """
+    
+    if errors not in ("raise", "skip"):
+        raise UUIDToolError(f"Unknown error mode: {errors}")
+    
+    uuid_ints = []
+    for uuid_str in uuid_strs:
+        try:
+            uuid_ints.append(parse_uuid(uuid_str.strip() if isinstance(uuid_str, str) else uuid_str))
+        except UUIDToolError:
+            if errors == "raise":
+                raise
+    
+    if packed:
+        return b"".join(uuid_int.to_bytes(16, "big") for uuid_int in uuid_ints)
+    return uuid_ints
 
 def get_uuid(uuid: "str | UUID") -> UUID:
     """Get a UUID
@@ -61,9 +126,9 @@ def get_uuid(uuid: "str | UUID") -> UUID:
     if isinstance(uuid, UUID):
         return uuid
     
-    if not is_uuid(uuid):
+    if not isinstance(uuid, str):
         raise UUIDToolError(f"{uuid} is not a valid UUID")
-    return UUID(uuid)
+    return UUID(int=parse_uuid(uuid))
 
 def get_version(uuid: UUID) -> int:
     """Get the version of a UUID
@@ -87,6 +152,21 @@ def get_variant(uuid: UUID) -> int:
     """
     return (uuid.int  >> 60) & 0xf
 
+def name_based_bytes(digest: bytes, version: int) -> bytes:
+    """Build the bytes of a name-based UUID (version 3 or 5) from the hash of its namespace and name
+
+    Args:
+        digest (bytes): The MD5 or SHA-1 digest, only the first 16 bytes are used
+        version (int): The UUID version
+
+    Returns:
+        bytes: The 16 bytes of the UUID, with the version and variant bits set
+    """
+    uuid_bytes = bytearray(digest[:16])
+    uuid_bytes[6] = (uuid_bytes[6] & 0x0f) | (version << 4)
+    uuid_bytes[8] = (uuid_bytes[8] & 0x3f) | 0x80
+    return bytes(uuid_bytes)
+
 def get_timestamp(uuid: UUID) -> int:
     """Get the timestamp from a UUID
 
@@ -105,11 +185,50 @@ def get_timestamp(uuid: UUID) -> int:
         timestamp_high = (uuid.int >> 64) & 0x0fff
         return ((timestamp_high << 16) | timestamp_low) * V2_CLOCK_TICK - GREGORIAN_UNIX_OFFSET
     elif version == 6:
-        return ((uuid.int >> 80) << 12) + ((uuid.int >> 64) & 4095) * 100 - GREGORIAN_UNIX_OFFSET
+        timestamp_high = uuid.int >> 80
+        timestamp_low = (uuid.int >> 64) & 0x0fff
+        return ((timestamp_high << 12) | timestamp_low) * 100 - GREGORIAN_UNIX_OFFSET
     elif version == 7:
         return (uuid.int >> 80) * 1_000_000
 
+
+def get_time_bounds(version: int) -> "tuple[int, int, int] | None":
+    """Get the clock tick and the bounds of the timestamps of a UUID version
+
+    Args:
+        version (int): The UUID version
+
+    Returns:
+        tuple[int, int, int] | None: The clock tick, the lowest and the highest timestamp in nanoseconds,
+        or None if this version has no timestamp
+    """
+    
+    if version in (1, 6):
+        return 100, -GREGORIAN_UNIX_OFFSET, 0x5966c59f06182ff9c
+    elif version == 2:
+        return V2_CLOCK_TICK, -GREGORIAN_UNIX_OFFSET, 0x5966c598621830000
+    elif version == 7:
+        return 1_000_000, 0, (2**48 - 1) * 1_000_000
+    return None
+    
+def shard_bounds(size: int, shard: int, shards: int) -> "tuple[int, int]":
+    """Get the positions of a shard, when a sequence is split into contiguous shards of (almost) the same size.
+    The bounds only depend on their arguments, so separate processes or machines agree on them.
+
+    Args:
+        size (int): The length of the sequence
+        shard (int): The index of the shard, from 0 to shards - 1
+        shards (int): The number of shards
+
+    Returns:
+        tuple[int, int]: The position of the first element of the shard, and the position after the last one
+    """
     
+    if not 0 <= shard < shards:
+        raise UUIDToolError(f"Shard must be between 0 and {shards - 1}, got {shard}")
+    
+    return size * shard // shards, size * (shard + 1) // shards
+
 def alt_sort(timestamps: list[int]) -> list[int]:
     """Sort a list of timestamps in an alternating pattern.
     This function assumes that the timestamps are already sorted in ascending order.
@@ -139,6 +258,49 @@ def alt_sort(timestamps: list[int]) -> list[int]:
         
     return out
 
+def iter_sorted(timestamps: range, sort: Literal["asc", "desc", "alt"] = "alt", start: int = 0) -> Iterator[int]:
+    """Lazily iterate over a range of timestamps in the given sort mode.
+    Unlike alt_sort, nothing is copied: the order is computed from the range itself.
+
+    Args:
+        timestamps (range): The timestamps to iterate over, in ascending order
+        sort (str): The sort mode, one of asc, desc or alt
+        start (int, optional): Position in the sorted order to start from. Defaults to 0.
+
+    Returns:
+        Iterator[int]: The timestamps in the requested order
+    """
+    
+    if sort == "asc":
+        return iter(timestamps[start:])
+    elif sort == "desc":
+        return iter(timestamps[::-1][start:])
+    elif sort == "alt":
+        return _iter_alt(timestamps, start)
+    else:
+        raise UUIDToolError(f"Unknown sort mode: {sort}")
+
+def _iter_alt(timestamps: range, start: int) -> Iterator[int]:
+    
+    size = len(timestamps)
+    mid = size // 2
+    odd = size % 2
+    
+    if odd and start == 0:
+        yield timestamps[mid]
+    
+    # After the middle element (if any), positions go by pairs: (mid - 1 - j, mid + odd + j)
+    lower = timestamps[:mid][::-1]
+    upper = timestamps[mid + odd:]
+    j, second = divmod(max(0, start - odd), 2)
+    if second and j < len(upper):
+        yield upper[j]
+        j += 1
+    
+    for low, high in zip(lower[j:], upper[j:]):
+        yield low
+        yield high
+
 def parse_time(time_str: "str | None") -> int:
     """Parse a string representing a time into an integer
 
@@ -152,6 +314,9 @@ def parse_time(time_str: "str | None") -> int:
     if time_str is None:
         return None
     
+    # Imported here since most commands never parse or format dates
+    from datetime import datetime
+    
     try:
         return int(datetime.fromisoformat(time_str).timestamp() * 1e9)
     except ValueError:
@@ -189,6 +354,24 @@ def get_int(arg: str, error_message: str, base: int = 10) -> int:
     except ValueError:
         raise UUIDToolError(error_message)
 
+def open_input(path: str) -> TextIO:
+    """Open a text file to read from
+
+    Args:
+        path (str): The path of the file, - means stdin
+
+    Returns:
+        TextIO: The opened file
+    """
+    
+    if path == "-":
+        return sys.stdin
+    
+    try:
+        return open(path)
+    except OSError as e:
+        raise UUIDToolError(f"Cannot open {path}: {e.strerror}")
+
 def strftime(timestamp_ns: int) -> str:
     """Format a timestamp into a string
 
@@ -199,6 +382,8 @@ def strftime(timestamp_ns: int) -> str:
         str: The formatted string
     """
     
+    from datetime import datetime, timedelta
+    
     try:
         dt = datetime(1970, 1, 1) + timedelta(seconds=timestamp_ns / 1e9)
         return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
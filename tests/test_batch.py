@@ -0,0 +1,32 @@
+import os
+from uuid import UUID
+
+import pytest
+
+from uuidtool.batch import decode_columns
+from uuidtool.commands.info import decode
+
+np = pytest.importorskip("numpy")
+
+
+def random_uuids(version: int, count: int) -> "list[UUID]":
+    uuids = []
+    for _ in range(count):
+        value = int.from_bytes(os.urandom(16), "big")
+        value = (value & ~(0xf << 76) & ~(0x3 << 62)) | (version << 76) | (0x2 << 62)
+        uuids.append(UUID(int=value))
+    return uuids
+
+
+@pytest.mark.parametrize("version", [1, 2, 6, 7, 4])
+def test_timestamps_are_exact_or_masked(version):
+    uuids = random_uuids(version, 2000)
+    columns = decode_columns(b"".join(uuid.bytes for uuid in uuids))
+
+    for uuid, value, masked in zip(uuids, columns["timestamp_ns"].data, np.ma.getmaskarray(columns["timestamp_ns"])):
+        expected = decode(uuid).timestamp_ns
+        if expected is None or not -2**63 <= expected < 2**63:
+            assert masked
+        else:
+            assert not masked
+            assert int(value) == expected
@@ -0,0 +1,38 @@
+import os, subprocess, sys
+
+import uuidtool
+
+# Budget for the cumulative import time of uuidtool.cli, in microseconds: about twice the ~35 ms it takes
+BUDGET_US = 70_000
+
+# Modules only some commands need, they must be imported when these commands run
+DEFERRED = ("uuidtool.commands", "numpy", "datetime")
+
+
+def import_times(module: str) -> "dict[str, int]":
+    """Import a module in a fresh interpreter and get the cumulative import time of every module it loads"""
+
+    src = os.path.dirname(os.path.dirname(uuidtool.__file__))
+    env = dict(os.environ, PYTHONPATH=src)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            env=env, capture_output=True, text=True, check=True)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_defers_heavy_imports():
+    loaded = import_times("uuidtool.cli")
+    assert "uuidtool.cli" in loaded
+    assert [name for name in loaded if name.startswith(DEFERRED)] == []
+
+
+def test_cli_import_budget():
+    # The fastest of a few runs, so that a busy machine doesn't make the test fail
+    best = min(import_times("uuidtool.cli")["uuidtool.cli"] for _ in range(5))
+    assert best < BUDGET_US
@@ -0,0 +1,37 @@
+import json
+
+from uuidtool.cli import main
+from uuidtool.commands.analyze import analyze
+from uuidtool.commands.new import uuid_v1
+from uuidtool.model import TimingModel
+
+# A Windows like clock, ticking every 15.6 ms, which doesn't divide the default period of 1 ms
+TICK_NS = 15_600_000
+BASE_NS = 1_700_000_000_000_000_000 - 1_700_000_000_000_000_000 % TICK_NS
+NODE = 0xaabbccddeeff
+
+
+def sample(count: int) -> "list[str]":
+    return [str(uuid_v1(BASE_NS + i * TICK_NS, 0x1234, NODE)) for i in range(count)]
+
+
+def test_fit_with_a_step_longer_than_the_period():
+    model = TimingModel.fit(sample(50), step_ns=TICK_NS)
+    assert model.period_ns % TICK_NS == 0
+
+    timestamps = range(BASE_NS, BASE_NS + 40 * TICK_NS, TICK_NS)
+    assert sorted(model.order(timestamps, "alt")) == list(timestamps)
+
+
+def test_sandwich_with_profile_and_fit(tmp_path):
+    uuids = sample(50)
+    profile = tmp_path / "profile.json"
+    profile.write_text(json.dumps(analyze(uuids)._asdict()))
+    fit = tmp_path / "sample.txt"
+    fit.write_text("\n".join(uuids) + "\n")
+    output = tmp_path / "out.txt"
+
+    uuid1, uuid2 = uuids[10], uuids[20]
+    main(["sandwich", uuid1, uuid2, "--profile", str(profile), "--fit", str(fit), "-o", str(output)])
+
+    assert sorted(output.read_text().split()) == sorted(uuids[11:20])
@@ -0,0 +1,26 @@
+from uuid import NAMESPACE_DNS, uuid3, uuid5
+
+from uuidtool.commands.crack import crack
+from uuidtool.commands.index import NameIndex, build_index
+
+WORDS = [b"alpha", b"example.com", b"omega"]
+TARGETS = [uuid3(NAMESPACE_DNS, "example.com"), uuid5(NAMESPACE_DNS, "omega")]
+
+
+def test_crack_finds_names():
+    result = crack(TARGETS, WORDS, ["@dns"])
+    assert sorted((str(uuid), name) for uuid, _, name in result.matches) == \
+        sorted([(str(TARGETS[0]), "example.com"), (str(TARGETS[1]), "omega")])
+
+
+def test_index_finds_names(tmp_path):
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_bytes(b"\n".join(WORDS) + b"\n")
+    build_index(str(wordlist), str(tmp_path / "words.idx"), ["@dns"])
+
+    index = NameIndex(str(tmp_path / "words.idx"))
+    try:
+        assert [name for _, name in index.lookup(TARGETS[0])] == ["example.com"]
+        assert [name for _, name in index.lookup(TARGETS[1])] == ["omega"]
+    finally:
+        index.close()
@@ -0,0 +1,18 @@
+import pytest
+
+from uuidtool.commands.nearest import iter_nearest
+from uuidtool.commands.range import iter_range
+
+ANCHOR = "05ae9f7d-833b-11ee-84d2-aabbccddeeff"
+
+
+@pytest.mark.parametrize("budget", [3, 5, 7, 101])
+def test_single_anchor_matches_alt_range(budget):
+    assert list(iter_nearest([ANCHOR], budget)) == list(iter_range(ANCHOR, budget, "alt"))
+
+
+@pytest.mark.parametrize("budget", [2, 6])
+def test_single_anchor_starts_from_anchor(budget):
+    uuids = list(iter_nearest([ANCHOR], budget))
+    assert len(uuids) == budget
+    assert str(uuids[0]) == ANCHOR
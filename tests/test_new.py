@@ -0,0 +1,62 @@
+import uuid
+
+import pytest
+
+from uuidtool.commands.new import UUIDv7Generator, new_uuid, new_uuids
+from uuidtool.utils import get_timestamp, get_version
+
+TIMESTAMP = 1.7e18
+CLOCK_SEQ = 1234.0
+NODE = "aa:bb:cc:dd:ee:ff"
+
+# Arguments of new_uuid and new_uuids giving the same UUID every time, floats like the uuid_v* functions accept
+FIXED = {
+    1: dict(timestamp_ns=TIMESTAMP, clock_seq=CLOCK_SEQ, node=NODE),
+    2: dict(timestamp_ns=TIMESTAMP, clock_seq=12.0, node=NODE, local_id=1000, local_domain=0),
+    3: dict(namespace="@dns", name="example.com"),
+    5: dict(namespace="@dns", name="example.com"),
+    6: dict(timestamp_ns=TIMESTAMP, clock_seq=CLOCK_SEQ, node=0xaabbccddeeff),
+    8: dict(custom_a=0x123456789abc, custom_b=0xdef, custom_c=0x123456789abcdef),
+}
+
+
+@pytest.mark.parametrize("version", sorted(FIXED))
+def test_batch_matches_new_uuid(version):
+    expected = new_uuid(version, **FIXED[version])
+    assert list(new_uuids(3, version, **FIXED[version])) == [expected] * 3
+
+
+def test_batch_v7_float_timestamp():
+    expected = new_uuid(7, TIMESTAMP)
+    for uuid in new_uuids(3, 7, TIMESTAMP):
+        assert get_version(uuid) == 7
+        assert get_timestamp(uuid) == get_timestamp(expected)
+
+
+@pytest.mark.parametrize("version", [1, 2, 4, 6, 7, 8])
+def test_batch_random_fields(version):
+    for uuid in new_uuids(100, version):
+        assert get_version(uuid) == version
+        assert uuid.variant == "specified in RFC 4122"
+
+
+def test_v7_generator_is_strictly_increasing():
+    generator = UUIDv7Generator()
+    previous = uuid.UUID(int=0)
+    # Counts below and above the size where NumPy is used
+    for n in (0, 1, 5, 1000, 3):
+        for u in generator.take(n) + [uuid.UUID(bytes=r) for r in _records(generator.take_packed(n))]:
+            assert get_version(u) == 7
+            assert u.variant == uuid.RFC_4122
+            assert u > previous
+            previous = u
+
+
+def test_v7_generator_frozen_clock():
+    generator = UUIDv7Generator(clock=lambda: 1_700_000_000_000_000_000)
+    uuids = generator.take(2000) + generator.take(2000)
+    assert uuids == sorted(set(uuids))
+
+
+def _records(packed: bytes) -> "list[bytes]":
+    return [packed[i:i + 16] for i in range(0, len(packed), 16)]
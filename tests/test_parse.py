@@ -0,0 +1,25 @@
+import pytest
+
+from uuidtool.utils import UUIDToolError, parse_many, parse_uuid
+
+UUID_STR = "e3aa7ac2-acd6-11ef-b995-e63af2894db7"
+UUID_INT = 0xe3aa7ac2acd611efb995e63af2894db7
+
+
+def test_parse_many_strips_lines():
+    lines = [f"{UUID_STR}\n", f"  {{{UUID_STR}}}\r\n", "\n", "not a uuid\n"]
+    assert parse_many(lines, errors="skip") == [UUID_INT, UUID_INT]
+    assert parse_many(lines[:2], packed=True) == UUID_INT.to_bytes(16, "big") * 2
+
+
+def test_parse_many_rejects_invalid_lines():
+    with pytest.raises(UUIDToolError):
+        parse_many([UUID_STR, "not a uuid"])
+
+
+def test_bytes_are_rejected():
+    with pytest.raises(UUIDToolError):
+        parse_uuid(UUID_STR.encode())
+    with pytest.raises(UUIDToolError):
+        parse_many([UUID_STR.encode()])
+    assert parse_many([UUID_STR.encode(), UUID_STR], errors="skip") == [UUID_INT]
@@ -0,0 +1,105 @@
+import asyncio, socket, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from uuidtool.cli import main
+from uuidtool.commands.probe import probe, probe_async
+from uuidtool.utils import UUIDToolError
+
+FOUND = "05ae9f55-833b-11ee-84d2-aabbccddeeff"
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """Answers 200 for /items/<FOUND> or anything under /all/ and 404 for any other item, recording the request targets"""
+
+    protocol_version = "HTTP/1.1"
+    paths = []
+
+    def do_GET(self):
+        self.paths.append(self.path)
+        found = self.path == f"/items/{FOUND}" or self.path.startswith("/all/")
+        status, body = (200, b"found") if found else (404, b"missing")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StandIn.paths = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def candidates(count: int, hit_at: int = None) -> "list[str]":
+    return [FOUND if i == hit_at else f"00000000-0000-4000-8000-{i:012x}" for i in range(count)]
+
+
+def test_hit(server):
+    result = probe(candidates(10, hit_at=3), f"{server}/items/{{uuid}}", concurrency=2)
+    assert result.hits == [(FOUND, 200)]
+
+
+def test_miss(server):
+    result = probe(candidates(10), f"{server}/items/{{uuid}}", concurrency=2)
+    assert result.hits == []
+    assert result.requests == 10
+
+
+def test_early_stop(server):
+    result = probe(candidates(1000, hit_at=5), f"{server}/items/{{uuid}}", concurrency=2, max_hits=1)
+    assert result.hits == [(FOUND, 200)]
+    assert result.requests < 100
+
+
+def test_hit_limit_with_requests_in_flight(server):
+    # Every candidate is a hit, so all the connections get one at about the same time
+    calls = []
+    result = probe(candidates(100), f"{server}/all/{{uuid}}", concurrency=8, max_hits=2,
+                   on_hit=lambda candidate, status: calls.append(candidate))
+    assert len(result.hits) == 2
+    assert calls == [candidate for candidate, _ in result.hits]
+
+
+def test_every_candidate_without_hit_limit(server):
+    result = probe(candidates(50, hit_at=5), f"{server}/items/{{uuid}}", concurrency=4, max_hits=0)
+    assert result.hits == [(FOUND, 200)]
+    assert result.requests == 50
+
+
+def test_fragment_is_not_sent(server):
+    probe(candidates(1), f"{server}/items/{{uuid}}?a=1#fragment", concurrency=1)
+    assert StandIn.paths == ["/items/00000000-0000-4000-8000-000000000000?a=1"]
+
+
+def test_cli_match_status_before_url(server, tmp_path, capsys):
+    candidates_file = tmp_path / "candidates.txt"
+    candidates_file.write_text("\n".join(candidates(5)) + "\n")
+
+    main(["probe", "--match-status", "404", "--match-status", "500", f"{server}/items/{{uuid}}",
+          "-f", str(candidates_file), "--max-hits", "2"])
+
+    assert len(capsys.readouterr().out.splitlines()) == 2
+    assert len(StandIn.paths) >= 2
+
+
+def test_refused_connection():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    # More candidates than the queue can hold, so the producer waits for workers that are gone
+    run = probe_async(candidates(100), f"http://127.0.0.1:{port}/items/{{uuid}}", concurrency=2)
+    start = time.perf_counter()
+    with pytest.raises(UUIDToolError, match="failed"):
+        asyncio.run(asyncio.wait_for(run, 10))
+    assert time.perf_counter() - start < 5
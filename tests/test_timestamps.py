@@ -0,0 +1,28 @@
+import pytest
+
+from uuidtool.commands.edit import set_time
+from uuidtool.commands.new import uuid_v1, uuid_v6
+from uuidtool.utils import GREGORIAN_UNIX_OFFSET, get_timestamp
+
+# Multiples of the 100 ns clock tick, with low 12 bits of the count of ticks that are not 0
+TIMESTAMPS = [
+    -GREGORIAN_UNIX_OFFSET,
+    -GREGORIAN_UNIX_OFFSET + 100,
+    0,
+    1_700_000_000_123_456_700,
+    0x5966c59f06182ff9c - 0x5966c59f06182ff9c % 100,
+]
+
+
+@pytest.mark.parametrize("timestamp_ns", TIMESTAMPS)
+def test_v6_timestamp_round_trip(timestamp_ns):
+    uuid = uuid_v6(0, 0x1234, 0xaabbccddeeff)
+    edited = set_time(uuid, timestamp_ns)
+    assert get_timestamp(edited) == timestamp_ns
+    assert get_timestamp(uuid_v6(timestamp_ns, 0x1234, 0xaabbccddeeff)) == timestamp_ns
+
+
+@pytest.mark.parametrize("timestamp_ns", TIMESTAMPS)
+def test_v6_matches_v1(timestamp_ns):
+    # Same 60 bits timestamp, only the layout differs
+    assert get_timestamp(uuid_v6(timestamp_ns, 0, 0)) == get_timestamp(uuid_v1(timestamp_ns, 0, 0))